@@ -7,7 +7,7 @@ import numpy as np
 import joblib
 import plotly.graph_objects as go
 
-from src.preprocessing import preprocess_text
+from src.analysis_context import DocumentContext
 from src.sentiment_vader import vader_sentiment
 from src.sentiment_distilbert import distilbert_sentiment
 from src.summarization import summarize_text
@@ -52,8 +52,12 @@ if analyze_btn and user_text.strip():
 
     with st.spinner("🔍 Analyzing..."):
 
+        # One context per request: sentences, tokens and model token ids
+        # are computed once and shared by every analyzer below
+        context = DocumentContext(user_text)
+
         # Preprocess
-        cleaned = preprocess_text(user_text)
+        cleaned = context.cleaned
 
         
 
@@ -64,16 +68,16 @@ if analyze_btn and user_text.strip():
         dominant_lda_topic = topic_name_map[dominant_idx + 1]
 
         # Semantic Topic Modeling (AI Reasoning)
-        semantic_scores = semantic_topic_scores(user_text)
+        semantic_scores = semantic_topic_scores(user_text, context=context)
         dominant_semantic_topic = max(semantic_scores, key=semantic_scores.get)
 
         # Sentiment
         vader = vader_sentiment(user_text)
-        bert = distilbert_sentiment(user_text)
+        bert = distilbert_sentiment(user_text, context=context)
 
         # Summary
-        extractive = summarize_text(user_text, 3)
-        abstractive = distilbart_summarize(user_text) if use_ai_summary else None
+        extractive = summarize_text(user_text, 3, context=context)
+        abstractive = distilbart_summarize(user_text, context=context, mode="chunked") if use_ai_summary else None
 
         # Insight
         final_sent = vader["sentiment"].split()[0]
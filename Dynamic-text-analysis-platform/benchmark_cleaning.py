@@ -0,0 +1,76 @@
+"""
+Microbenchmark: precompiled / str.translate cleaners in src.text_cleaning
+against the per-call regex versions they replaced, on a synthetic corpus.
+
+    python benchmark_cleaning.py [n_docs]
+"""
+import random
+import re
+import sys
+import time
+
+from src.text_cleaning import clean_batch, clean_sentence, normalize_for_topics
+
+
+def legacy_normalize(text):
+    text = text.lower()
+    text = re.sub(r"http\S+|www\S+", "", text)
+    text = re.sub(r"[^a-zA-Z\s]", " ", text)
+    return text
+
+
+def legacy_clean_sentence(sentence):
+    sentence = re.sub(r"http\S+", "", sentence)
+    sentence = re.sub(r"\S+@\S+", "", sentence)
+    sentence = re.sub(r"#\w+", "", sentence)
+    sentence = re.sub(r"[^\w\s.,]", "", sentence)
+    return sentence.strip()
+
+
+WORDS = [
+    "Market", "data", "growth", "AI", "investors", "policy", "2024", "report",
+    "climate", "energy", "#trending", "user@example.com", "https://example.com/a?b=1",
+    "www.news.org", "rose", "12.5%", "Health", "costs", "U.S.", "(2023)"
+]
+NON_ASCII_WORDS = ["café", "naïve", "🚀", "—", "€40", "Zürich"]
+
+
+def synthetic_corpus(n_docs, words_per_doc=60, non_ascii_share=0.1, seed=42):
+    # Mostly plain-ASCII documents, with a share containing accents/emoji.
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n_docs):
+        words = [rng.choice(WORDS) for _ in range(words_per_doc)]
+        if rng.random() < non_ascii_share:
+            words.append(rng.choice(NON_ASCII_WORDS))
+        corpus.append(" ".join(words) + ".")
+    return corpus
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    out = [fn(t) for t in texts]
+    return time.perf_counter() - start, out
+
+
+def main(n_docs=100_000):
+    corpus = synthetic_corpus(n_docs)
+    print(f"Synthetic corpus: {n_docs} documents (~10% non-ASCII)\n")
+
+    cases = [
+        ("preprocess cleanup", legacy_normalize, normalize_for_topics),
+        ("clean_sentence", legacy_clean_sentence, clean_sentence),
+    ]
+    for name, old, new in cases:
+        t_old, out_old = timed(old, corpus)
+        start = time.perf_counter()
+        out_new = clean_batch(corpus, cleaner=new)
+        t_new = time.perf_counter() - start
+        print(f"{name}:")
+        print(f"  legacy : {t_old:.3f}s")
+        print(f"  new    : {t_new:.3f}s  ({t_old / t_new:.2f}x)")
+        print(f"  identical output: {out_old == out_new}\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,95 @@
+"""
+Benchmark: per-document semantic topic clustering with the fast backends
+in src.semantic_topic against the original KMeans(n_init=10) with a
+TF-IDF refit per cluster. Reports time and how stable the labels are
+(adjusted Rand index vs the original clustering, and topic-name overlap).
+
+    python benchmark_semantic_clustering.py [--backend auto] [--repeat 3]
+"""
+import argparse
+import time
+
+import nltk
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import adjusted_rand_score
+
+from src.input_handler import load_texts
+from src.semantic_topic import (
+    cluster_sentences,
+    cluster_topic_scores,
+    encode_sentences,
+    CLUSTER_BACKENDS
+)
+
+
+def legacy_topic_scores(sentences, embeddings, n_topics=3):
+    k = min(n_topics, len(sentences))
+    labels = KMeans(n_clusters=k, n_init=10, random_state=42).fit_predict(embeddings)
+
+    clusters = {}
+    for i, label in enumerate(labels):
+        clusters.setdefault(label, []).append(sentences[i])
+
+    vectorizer = TfidfVectorizer(stop_words="english", max_features=4)
+    topic_scores = {}
+    for label, group in clusters.items():
+        tfidf = vectorizer.fit_transform(group)
+        words = vectorizer.get_feature_names_out()
+        scores = tfidf.toarray().sum(axis=0)
+        topic_name = " ".join(words[i] for i in scores.argsort()[-3:]).title()
+        topic_scores[topic_name] = len(group)
+
+    total = sum(topic_scores.values())
+    return labels, {name: count / total for name, count in topic_scores.items()}
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def name_words(scores):
+    return {word for name in scores for word in name.lower().split()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="auto", choices=CLUSTER_BACKENDS)
+    parser.add_argument("--n-topics", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docs = [nltk.sent_tokenize(t) for t in load_texts()]
+    docs = [d for d in docs if len(d) >= 2]
+
+    t_old = t_new = 0.0
+    aris, overlaps = [], []
+    for sentences in docs:
+        embeddings = encode_sentences(sentences)
+        k = min(args.n_topics, len(sentences))
+
+        dt, (old_labels, old_scores) = timed(
+            lambda: legacy_topic_scores(sentences, embeddings, args.n_topics), args.repeat)
+        t_old += dt
+        dt, new_scores = timed(
+            lambda: cluster_topic_scores(sentences, embeddings, args.n_topics, args.backend), args.repeat)
+        t_new += dt
+
+        new_labels = cluster_sentences(embeddings, k, args.backend)
+        aris.append(adjusted_rand_score(old_labels, new_labels))
+        old_words, new_words = name_words(old_scores), name_words(new_scores)
+        overlaps.append(len(old_words & new_words) / max(len(old_words | new_words), 1))
+
+    print(f"Documents: {len(docs)}   backend: {args.backend}")
+    print(f"  legacy KMeans(n_init=10) : {t_old * 1000:8.1f} ms")
+    print(f"  new                      : {t_new * 1000:8.1f} ms  ({t_old / t_new:.1f}x)")
+    print(f"  label stability (ARI)    : mean {np.mean(aris):.2f}, min {np.min(aris):.2f}")
+    print(f"  topic-name word overlap  : mean {np.mean(overlaps):.2f}")
+
+
+if __name__ == "__main__":
+    main()
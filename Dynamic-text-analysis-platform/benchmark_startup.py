@@ -0,0 +1,63 @@
+"""
+Startup benchmark: import time of each module in a fresh interpreter,
+optionally followed by the time to warm up every registered model.
+
+    python benchmark_startup.py [--runs 3] [--warmup]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "src.model_loader",
+    "src.preprocessing",
+    "src.topic_model",
+    "src.sentiment_vader",
+    "src.sentiment_distilbert",
+    "src.logistic_sentiment",
+    "src.semantic_topic",
+    "src.summarization",
+    "src.summarization_distilbart",
+    "main",
+]
+
+SNIPPET = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def import_time(module):
+    result = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(module=module)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--warmup", action="store_true", help="also time loading every model")
+    args = parser.parse_args()
+
+    print(f"{'module':32} {'import (s)':>10}")
+    for module in MODULES:
+        times = [import_time(module) for _ in range(args.runs)]
+        if None in times:
+            print(f"{module:32} {'failed':>10}")
+            continue
+        print(f"{module:32} {statistics.median(times):10.3f}")
+
+    if args.warmup:
+        from src.model_loader import warmup
+        print(f"\n{'model':32} {'load (s)':>10}")
+        for name, seconds in warmup().items():
+            print(f"{name:32} {seconds:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Offline parity check: compares a candidate inference backend against the
+full-precision PyTorch models on the documents in data/raw.
+
+    python check_backend_parity.py --backend quantized
+    python check_backend_parity.py --backend onnx --skip-summary
+
+Models are read from the local Hugging Face cache (HF_HUB_OFFLINE=1), so
+download them once with the default backend before running this.
+Exits with status 1 when the candidate drifts past the tolerances.
+"""
+import os
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import argparse
+import sys
+import numpy as np
+import torch
+
+from src.inference_backend import load_model
+from src.input_handler import load_texts
+from src.model_loader import DISTILBART_MODEL
+from src.sentiment_distilbert import MAX_TOKENS, MODEL_NAME as DISTILBERT_MODEL
+
+
+def sentiment_probs(texts, backend):
+    tokenizer, model = load_model("sentiment-analysis", DISTILBERT_MODEL, backend)
+    batch = tokenizer(texts, truncation=True, max_length=MAX_TOKENS, padding=True, return_tensors="pt")
+    with torch.inference_mode():
+        logits = model(**batch).logits
+    return torch.softmax(torch.as_tensor(logits), dim=-1).numpy()
+
+
+def summaries(texts, backend, max_length=60):
+    tokenizer, model = load_model("summarization", DISTILBART_MODEL, backend)
+    batch = tokenizer(texts, truncation=True, max_length=1024, padding=True, return_tensors="pt")
+    with torch.inference_mode():
+        ids = model.generate(**batch, num_beams=2, max_length=max_length, min_length=10)
+    return tokenizer.batch_decode(ids, skip_special_tokens=True)
+
+
+def token_overlap(a, b):
+    a, b = set(a.lower().split()), set(b.lower().split())
+    return len(a & b) / max(len(a | b), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="quantized", choices=["quantized", "onnx"])
+    parser.add_argument("--prob-tol", type=float, default=0.05)
+    parser.add_argument("--min-overlap", type=float, default=0.6)
+    parser.add_argument("--skip-summary", action="store_true")
+    args = parser.parse_args()
+
+    texts = load_texts()
+    ok = True
+
+    ref = sentiment_probs(texts, "pytorch")
+    cand = sentiment_probs(texts, args.backend)
+    max_diff = float(np.abs(ref - cand).max())
+    agreement = float((ref.argmax(1) == cand.argmax(1)).mean())
+    print(f"DistilBERT  max |Δp| = {max_diff:.4f}   label agreement = {agreement:.0%}")
+    ok &= max_diff <= args.prob_tol and agreement == 1.0
+
+    if not args.skip_summary:
+        docs = texts[:3]
+        ref_sum = summaries(docs, "pytorch")
+        cand_sum = summaries(docs, args.backend)
+        overlap = min(token_overlap(r, c) for r, c in zip(ref_sum, cand_sum))
+        print(f"DistilBART  min token overlap = {overlap:.2f}")
+        ok &= overlap >= args.min_overlap
+
+    print("✅ Parity OK" if ok else "❌ Parity check failed")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Evaluation harness for the DistilBART summarization modes on the
+documents in data/raw: latency plus two reference-free quality proxies.
+
+  keyword coverage – share of each document's top TF-IDF terms that
+                     appear in its summary (does the summary reach the
+                     whole document or only its start?)
+  ROUGE-1 / ROUGE-2 – F1 against the reference mode's summary (default
+                     "chunked", which reads every part of the document)
+
+    python evaluate_summarization.py
+    python evaluate_summarization.py --concat 5 --token-budget 512
+
+--concat joins consecutive documents into longer synthetic reports.
+Models are read from the local Hugging Face cache (HF_HUB_OFFLINE=1).
+The summary cache is bypassed so every mode really runs.
+"""
+import os
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.input_handler import load_texts
+from src.model_loader import get_model
+from src.summarization_distilbart import MODES, distilbart_summarize_batch
+
+
+def ngrams(text, n):
+    words = text.lower().split()
+    return Counter(zip(*(words[i:] for i in range(n))))
+
+
+def rouge_f1(candidate, reference, n):
+    cand, ref = ngrams(candidate, n), ngrams(reference, n)
+    overlap = sum((cand & ref).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(cand.values())
+    recall = overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def top_keywords(texts, k):
+    vectorizer = TfidfVectorizer(stop_words="english")
+    tfidf = vectorizer.fit_transform(texts).toarray()
+    words = vectorizer.get_feature_names_out()
+    return [set(words[np.argsort(row)[-k:]]) for row in tfidf]
+
+
+def keyword_coverage(summary, keywords):
+    summary_words = set(summary.lower().split())
+    return len(keywords & summary_words) / max(len(keywords), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--reference", default="chunked", choices=MODES)
+    parser.add_argument("--concat", type=int, default=1)
+    parser.add_argument("--token-budget", type=int, default=None)
+    parser.add_argument("--keywords", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = load_texts()
+    if args.concat > 1:
+        texts = [" ".join(texts[i:i + args.concat]) for i in range(0, len(texts), args.concat)]
+    keywords = top_keywords(texts, args.keywords)
+
+    # Load outside the timed region
+    get_model("distilbart")
+
+    modes = list(dict.fromkeys(args.modes + [args.reference]))
+    summaries, seconds = {}, {}
+    for mode in modes:
+        start = time.perf_counter()
+        results = distilbart_summarize_batch(
+            texts, mode=mode, use_cache=False, token_budget=args.token_budget
+        )
+        seconds[mode] = time.perf_counter() - start
+        summaries[mode] = [result[0] for result in results]
+
+    reference = summaries[args.reference]
+    print(f"Documents: {len(texts)}   avg words: {np.mean([len(t.split()) for t in texts]):.0f}")
+    print(f"{'mode':<10}{'total s':>10}{'s/doc':>9}{'keywords':>10}{'ROUGE-1':>9}{'ROUGE-2':>9}")
+    for mode in args.modes:
+        coverage = np.mean([keyword_coverage(s, k) for s, k in zip(summaries[mode], keywords)])
+        r1 = np.mean([rouge_f1(s, r, 1) for s, r in zip(summaries[mode], reference)])
+        r2 = np.mean([rouge_f1(s, r, 2) for s, r in zip(summaries[mode], reference)])
+        print(f"{mode:<10}{seconds[mode]:>10.2f}{seconds[mode] / len(texts):>9.2f}"
+              f"{coverage:>10.2f}{r1:>9.2f}{r2:>9.2f}")
+    print(f"(ROUGE against '{args.reference}')")
+
+
+if __name__ == "__main__":
+    main()
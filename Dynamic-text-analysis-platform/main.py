@@ -5,25 +5,30 @@ import numpy as np
 import os
 
 
-from gensim.corpora import Dictionary
-from gensim.models import CoherenceModel
 from collections import Counter
 
 
-from src.input_handler import load_texts
-from src.preprocessing import preprocess_text
-from src.topic_model import create_dtm, apply_lda, display_topics
+from src.input_handler import stream_texts
+from src.preprocessing import PreprocessPool, save_token_cache, cache_stats, TOKEN_CACHE_PATH
+from src.topic_model import sweep_lda, display_topics, top_word_indices, TOPIC_SUMMARY_PATH
+from src.coherence import CoherenceScorer
+from src.dtm_builder import build_dtm, save_dtm
 from src.sentiment_vader import vader_sentiment
 #(activate it when you want to run distilbert)
-from src.sentiment_distilbert import distilbert_sentiment
-from src.logistic_sentiment import logistic_sentiment
+from src.sentiment_distilbert import distilbert_sentiment_batch
+from src.logistic_sentiment import logistic_sentiment_batch
 from src.summarization import summarize_text
 #(activate it when you want to run distilbart summarisation)
 
-from src.summarization_distilbart import distilbart_summarize
+from src.summarization_distilbart import distilbart_summarize_batch
 from src.insight_generator import generate_user_insight
 from src.visualizations import plot_wordcloud
-from src.semantic_topic import semantic_topic_scores
+from src.semantic_topic import (
+    fit_global_topics,
+    save_global_topics,
+    semantic_topic_scores_corpus,
+    SEMANTIC_MODEL_PATH
+)
 
 
 import multiprocessing
@@ -44,28 +49,11 @@ def download_nltk_resources():
     nltk.download("vader_lexicon")
 
 
-def compute_coherence(lda_model, cleaned_texts, vectorizer, top_n=10):
-    tokenized_texts = [text.split() for text in cleaned_texts]
-    dictionary = Dictionary(tokenized_texts)
-
+def compute_coherence(lda_model, coherence_scorer, vectorizer, top_n=10):
     feature_names = vectorizer.get_feature_names_out()
-    topics = []
-
-    for topic_weights in lda_model.components_:
-        top_words = [
-            feature_names[i]
-            for i in topic_weights.argsort()[:-top_n - 1:-1]
-        ]
-        topics.append(top_words)
-
-    coherence_model = CoherenceModel(
-        topics=topics,
-        texts=tokenized_texts,
-        dictionary=dictionary,
-        coherence='c_v'
-    )
+    topics = feature_names[top_word_indices(lda_model.components_, top_n)]
 
-    return coherence_model.get_coherence()
+    return coherence_scorer.score(topics, measure="c_v")
 
 
 # 🔐 REQUIRED ON WINDOWS
@@ -75,17 +63,26 @@ if __name__ == "__main__":
     os.makedirs("outputs/graphs", exist_ok=True)
     os.makedirs("outputs/results", exist_ok=True)
 
-    # 1️⃣ Load & preprocess data
-    texts = load_texts()
-    cleaned_texts = [preprocess_text(t) for t in texts]
+    # 1️⃣ Load & preprocess data, streamed in batches through one pool
+    doc_ids, texts, cleaned_texts = [], [], []
+    with PreprocessPool(cache_path=TOKEN_CACHE_PATH) as preprocess:
+        for batch in stream_texts("data/raw", batch_size=256, recursive=False):
+            batch_texts = [text for _, text in batch]
+            doc_ids.extend(doc_id for doc_id, _ in batch)
+            texts.extend(batch_texts)
+            cleaned_texts.extend(preprocess(batch_texts))
+    save_token_cache(TOKEN_CACHE_PATH)
+    print(f"Token cache: {cache_stats()}")
     # Semantic Topic Analysis (Knowledge-based)
-    semantic_results = []
-    for text in texts:
-        scores = semantic_topic_scores(text)
-        dominant_semantic_topic = max(scores, key=scores.get)
-        semantic_results.append(dominant_semantic_topic)
-        from collections import Counter
-        semantic_counts = Counter(semantic_results)
+    # Centroids are fitted once over the corpus so every document is
+    # labeled against the same topics, then saved for the web app
+    semantic_model = fit_global_topics(texts)
+    save_global_topics(semantic_model, SEMANTIC_MODEL_PATH)
+    semantic_results = [
+        max(scores, key=scores.get)
+        for scores in semantic_topic_scores_corpus(texts, model=semantic_model)
+    ]
+    semantic_counts = Counter(semantic_results)
     #sorting important bigiluuuuuuuuuuu boggu ayipoyav ga................
     """print("\n📄 RAW TEXT OF DOCUMENT 11 (doc11.txt):\n")
     print(texts[10])
@@ -115,26 +112,32 @@ if __name__ == "__main__":
 
 
     # 2️⃣ Create DTM
-    dtm, vectorizer = create_dtm(cleaned_texts)
+    dtm, vectorizer = build_dtm(cleaned_texts)
+    save_dtm("outputs/results/dtm.npz", dtm, vectorizer.get_feature_names_out())
+
+    # Co-occurrence statistics are built once and shared by every candidate
+    coherence_scorer = CoherenceScorer(
+        [text.split() for text in cleaned_texts],
+        vectorizer.get_feature_names_out()
+    )
 
     # 3️⃣ Topic range to evaluate
     topic_values = [2, 4, 5, 6, 7, 8, 10]
 
-    perplexity_scores = []
-    coherence_scores = []
-
     print("\n📊 Evaluating topic models:\n")
 
-    # 4️⃣ Train & evaluate models
-    for k in topic_values:
-        lda_model = apply_lda(dtm, n_topics=k)
-
-        perplexity = lda_model.perplexity(dtm)
-        coherence = compute_coherence(lda_model, cleaned_texts, vectorizer)
+    # 4️⃣ Train & evaluate models (parallel, stops once coherence plateaus)
+    sweep = sweep_lda(
+        dtm,
+        topic_values,
+        score_fn=lambda model: compute_coherence(model, coherence_scorer, vectorizer)
+    )
 
-        perplexity_scores.append(perplexity)
-        coherence_scores.append(coherence)
+    topic_values = sorted(sweep["models"])
+    perplexity_scores = [sweep["perplexity"][k] for k in topic_values]
+    coherence_scores = [sweep["coherence"][k] for k in topic_values]
 
+    for k, perplexity, coherence in zip(topic_values, perplexity_scores, coherence_scores):
         print(f"Topics: {k}")
         print(f"  Perplexity: {perplexity}")
         print(f"  Coherence: {coherence}\n")
@@ -163,20 +166,22 @@ if __name__ == "__main__":
     plt.show()
 
     # 6️⃣ Automatically select best topic count
-    best_index = np.argmax(coherence_scores)
-    BEST_NUM_TOPICS = topic_values[best_index]
+    BEST_NUM_TOPICS = sweep["best_k"]
 
     print(f"\n✅ Automatically selected best number of topics: {BEST_NUM_TOPICS}")
 
-    # 7️⃣ Train final model
-    final_lda_model = apply_lda(dtm, n_topics=BEST_NUM_TOPICS)
+    # 7️⃣ Reuse the already fitted model for the winning k
+    final_lda_model = sweep["models"][BEST_NUM_TOPICS]
 
     print("\n🧠 Final selected model topics:\n")
-    topic_name_map = display_topics(final_lda_model, vectorizer, n_words=10)
-
     import joblib
     os.makedirs("models", exist_ok=True)
 
+    # Top words are computed once and saved next to the model
+    topic_name_map = display_topics(
+        final_lda_model, vectorizer, n_words=10, cache_path=TOPIC_SUMMARY_PATH
+    )
+
     joblib.dump(final_lda_model, "models/lda_model.pkl")
     joblib.dump(vectorizer, "models/vectorizer.pkl")
     joblib.dump(topic_name_map, "models/topic_names.pkl")
@@ -253,8 +258,14 @@ if __name__ == "__main__":
     #((keep it false when yOU dont want to run distilbart)
     RUN_DISTILBART = True   # change to False to skip summarization
 
+    logistic_results = logistic_sentiment_batch(texts)
+    #have to comment for pause distilbert
+    bert_results = distilbert_sentiment_batch(texts, strategy="window", reducer="weighted")
+    # Whole corpus in a few batched generate calls instead of one per document
+    distilbart_results = distilbart_summarize_batch(texts) if RUN_DISTILBART else None
+
     for i, text in enumerate(texts):
-        print(f"📄 Document {i+1}:")
+        print(f"📄 Document {i+1} ({doc_ids[i]}):")
 
         summary = summarize_text(text, num_sentences=3)
         print("📝 Summary:")
@@ -263,14 +274,13 @@ if __name__ == "__main__":
 
 
         vader_result = vader_sentiment(text)
-        logistic_result = logistic_sentiment(text)
         #have to comment for pause distilbert
-        bert_result = distilbert_sentiment(text)
+        bert_result = bert_results[i]
 
         vader_label = vader_result["sentiment"].split()[0]
-        logistic_label = logistic_result["sentiment"].split()[0]
+        logistic_label = logistic_results["labels"][i]
         #have to comment for pause distilbert
-        bert_label = bert_result["sentiment"].split()[0]
+        bert_label = bert_result["label"].title()
 
         vader_counts[vader_label] += 1
         logistic_counts[logistic_label] += 1
@@ -283,20 +293,20 @@ if __name__ == "__main__":
 
         
         print("\n📊 Logistic Regression Result:")
-        print(f"  Sentiment  : {logistic_result['sentiment']}")
-        print(f"  Confidence : {logistic_result['confidence']:.2f}")
+        print(f"  Sentiment  : {logistic_results['sentiment'][i]}")
+        print(f"  Confidence : {logistic_results['confidence'][i]:.2f}")
 
       #have to comment for pause distilbert
         print("\n🤖 DistilBERT Result:")
-        print(f"  Sentiment : {bert_result['sentiment']}")
-        print(f"  Confidence: {bert_result['confidence']:.2f}")
+        print(f"  Sentiment : {bert_result['label']}")
+        print(f"  Confidence: {bert_result['score']:.2f}")
         #until this
 
         # 📝 SUMMARY
        
 
         if RUN_DISTILBART:
-          summary = distilbart_summarize(text)
+          summary = distilbart_results[i]
           print("📝 Summary:")
           for line in summary:
             print(f"• {line}")
@@ -0,0 +1,82 @@
+# src/analysis_context.py
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+from src.text_cleaning import normalize_for_topics
+
+
+class DocumentContext:
+    """
+    Everything the analyzers derive from one input text, computed lazily
+    and at most once: sentences, whitespace words, topic tokens / cleaned
+    text, and model token ids per tokenizer.
+    Build one per document and pass it to every analyzer.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._sentences = None
+        self._words = None
+        self._topic_tokens = None
+        self._cleaned = None
+        self._token_ids = {}
+        self._sentence_token_ids = {}
+
+    @property
+    def sentences(self):
+        if self._sentences is None:
+            self._sentences = sent_tokenize(self.text)
+        return self._sentences
+
+    @property
+    def words(self):
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def normalized_text(self):
+        # Whitespace-collapsed text, the form fed to the HF tokenizers
+        return " ".join(self.words)
+
+    @property
+    def topic_tokens(self):
+        if self._topic_tokens is None:
+            self._topic_tokens = word_tokenize(normalize_for_topics(self.text))
+        return self._topic_tokens
+
+    @property
+    def cleaned(self):
+        # Same output as preprocess_text(self.text)
+        if self._cleaned is None:
+            from src.preprocessing import lemmatize_tokens
+            self._cleaned = " ".join(lemmatize_tokens(self.topic_tokens))
+        return self._cleaned
+
+    def token_ids(self, tokenizer):
+        """
+        Token ids of the whole text without special tokens, tokenized once
+        per tokenizer; callers truncate / window / add special tokens.
+        """
+        key = (type(tokenizer).__name__, tokenizer.name_or_path)
+        if key not in self._token_ids:
+            self._token_ids[key] = tokenizer(
+                self.normalized_text, add_special_tokens=False
+            )["input_ids"]
+        return self._token_ids[key]
+
+    def sentence_token_ids(self, tokenizer):
+        """
+        Token ids per sentence (no special tokens). Every sentence after
+        the first keeps its leading space, so concatenated sentences decode
+        the same as the running text.
+        """
+        key = (type(tokenizer).__name__, tokenizer.name_or_path)
+        if key not in self._sentence_token_ids:
+            pieces = [
+                (" " if i else "") + " ".join(sentence.split())
+                for i, sentence in enumerate(self.sentences)
+            ]
+            self._sentence_token_ids[key] = tokenizer(
+                pieces, add_special_tokens=False
+            )["input_ids"] if pieces else []
+        return self._sentence_token_ids[key]
@@ -0,0 +1,174 @@
+# src/coherence.py
+import numpy as np
+from scipy import sparse
+from numpy.lib.stride_tricks import sliding_window_view
+
+EPSILON = 1e-12
+
+# Window sizes follow gensim's CoherenceModel defaults;
+# None means boolean document co-occurrence.
+DEFAULT_WINDOWS = {
+    "c_v": 110,
+    "c_npmi": 10,
+    "u_mass": None
+}
+
+# Flush accumulated window entries into the co-occurrence matrix
+# once this many (window, word) pairs are buffered.
+_FLUSH_ENTRIES = 5_000_000
+
+
+class CooccurrenceIndex:
+    """
+    Boolean occurrence and co-occurrence counts of a corpus over sliding
+    windows (or whole documents), built in one pass and kept as a sparse
+    vocab x vocab matrix. Windows slide over every token, including
+    out-of-vocabulary ones, the same way gensim's accumulator does.
+    """
+
+    def __init__(self, tokenized_texts, vocabulary, window_size=None):
+        self.vocabulary = {word: i for i, word in enumerate(vocabulary)}
+        self.window_size = window_size
+
+        n_vocab = len(self.vocabulary)
+        self.word_counts = np.zeros(n_vocab, dtype=np.int64)
+        self.cooccurrence = sparse.csr_matrix((n_vocab, n_vocab), dtype=np.int64)
+        self.num_windows = 0
+
+        rows, cols, buffered = [], [], 0
+        for tokens in tokenized_texts:
+            ids = np.fromiter(
+                (self.vocabulary.get(t, -1) for t in tokens),
+                dtype=np.int64,
+                count=len(tokens)
+            )
+            r, c = self._windows(ids)
+            rows.append(r)
+            cols.append(c)
+            buffered += len(c)
+            if buffered >= _FLUSH_ENTRIES:
+                self._flush(rows, cols)
+                rows, cols, buffered = [], [], 0
+        self._flush(rows, cols)
+
+    def _windows(self, ids):
+        w = self.window_size
+        start = self.num_windows
+
+        if w is None or len(ids) <= w:
+            self.num_windows += 1
+            c = np.unique(ids[ids >= 0])
+            return np.full(len(c), start), c
+
+        windows = sliding_window_view(ids, w)
+        self.num_windows += len(windows)
+        r = np.repeat(np.arange(start, start + len(windows)), w)
+        c = windows.ravel()
+        keep = c >= 0
+        return r[keep], c[keep]
+
+    def _flush(self, rows, cols):
+        if not rows:
+            return
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        if len(rows) == 0:
+            return
+
+        offset = rows.min()
+        n_rows = rows.max() - offset + 1
+        occurrence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows - offset, cols)),
+            shape=(n_rows, len(self.vocabulary))
+        )
+        occurrence.sum_duplicates()
+        occurrence.data[:] = 1   # boolean: present in the window or not
+
+        self.word_counts += np.asarray(occurrence.sum(axis=0)).ravel()
+        self.cooccurrence = self.cooccurrence + (occurrence.T @ occurrence).tocsr()
+
+    def word_ids(self, words):
+        missing = [w for w in words if w not in self.vocabulary]
+        if missing:
+            raise ValueError(f"Topic words not in the coherence vocabulary: {missing}")
+        return np.array([self.vocabulary[w] for w in words])
+
+    def probabilities(self, words):
+        """
+        returns: (P(w) vector, P(w_i, w_j) matrix) for the given words
+        """
+        ids = self.word_ids(words)
+        joint = self.cooccurrence[ids][:, ids].toarray()
+        return self.word_counts[ids] / self.num_windows, joint / self.num_windows
+
+
+def _npmi(p_word, p_joint):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmi = np.log((p_joint + EPSILON) / np.outer(p_word, p_word))
+        npmi = pmi / -np.log(p_joint + EPSILON)
+    return np.nan_to_num(npmi)
+
+
+def _c_v(index, words):
+    # One-set segmentation with indirect cosine confirmation over NPMI
+    # context vectors (gamma = 1).
+    p_word, p_joint = index.probabilities(words)
+    vectors = _npmi(p_word, p_joint)
+    topic_vector = vectors.sum(axis=0)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(topic_vector)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sims = np.nan_to_num((vectors @ topic_vector) / norms)
+    return sims.mean()
+
+
+def _c_npmi(index, words):
+    # One-one segmentation: every ordered pair of distinct words.
+    p_word, p_joint = index.probabilities(words)
+    npmi = _npmi(p_word, p_joint)
+    off_diagonal = ~np.eye(len(words), dtype=bool)
+    return npmi[off_diagonal].mean()
+
+
+def _u_mass(index, words):
+    # One-preceding segmentation: log P(w_i, w_j) / P(w_j) for j < i.
+    p_word, p_joint = index.probabilities(words)
+    with np.errstate(divide="ignore"):
+        log_cond = np.log((p_joint + EPSILON) / p_word[None, :])
+    rows, cols = np.tril_indices(len(words), k=-1)
+    return log_cond[rows, cols].mean()
+
+
+MEASURES = {
+    "c_v": _c_v,
+    "c_npmi": _c_npmi,
+    "u_mass": _u_mass
+}
+
+
+class CoherenceScorer:
+    """
+    Scores any number of topic lists against one corpus. The
+    co-occurrence index for each window size is built once, on first use,
+    and reused for every later call.
+    """
+
+    def __init__(self, tokenized_texts, vocabulary):
+        self.tokenized_texts = tokenized_texts
+        self.vocabulary = list(vocabulary)
+        self._indexes = {}
+
+    def index(self, window_size):
+        if window_size not in self._indexes:
+            self._indexes[window_size] = CooccurrenceIndex(
+                self.tokenized_texts, self.vocabulary, window_size
+            )
+        return self._indexes[window_size]
+
+    def score_per_topic(self, topics, measure="c_v"):
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown coherence measure '{measure}'. Choose from {tuple(MEASURES)}.")
+        index = self.index(DEFAULT_WINDOWS[measure])
+        return np.array([MEASURES[measure](index, list(words)) for words in topics])
+
+    def score(self, topics, measure="c_v"):
+        return float(self.score_per_topic(topics, measure).mean())
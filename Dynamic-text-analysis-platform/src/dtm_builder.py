@@ -0,0 +1,181 @@
+# src/dtm_builder.py
+import numbers
+import os
+import struct
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+# Same tokenization as create_dtm's CountVectorizer
+_analyze = CountVectorizer(stop_words="english").build_analyzer()
+
+# Set in each worker by _init_vocabulary so shards don't re-send it
+_vocabulary = None
+
+
+def _shards(texts, shard_size):
+    for start in range(0, len(texts), shard_size):
+        yield texts[start:start + shard_size]
+
+
+def _document_frequencies(texts):
+    df = Counter()
+    for text in texts:
+        df.update(set(_analyze(text)))
+    return df
+
+
+def _init_vocabulary(vocabulary):
+    global _vocabulary
+    _vocabulary = vocabulary
+
+
+def _count_shard(texts, dtype):
+    indptr = [0]
+    indices = []
+    data = []
+    for text in texts:
+        counts = Counter(
+            _vocabulary[token] for token in _analyze(text) if token in _vocabulary
+        )
+        ids = sorted(counts)
+        indices.extend(ids)
+        data.extend(counts[i] for i in ids)
+        indptr.append(len(indices))
+
+    return sparse.csr_matrix(
+        (
+            np.asarray(data, dtype=dtype),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64)
+        ),
+        shape=(len(texts), len(_vocabulary))
+    )
+
+
+def _prune(df, n_docs, min_df, max_df):
+    # Same semantics as CountVectorizer: floats are fractions of n_docs
+    max_count = max_df if isinstance(max_df, numbers.Integral) else max_df * n_docs
+    min_count = min_df if isinstance(min_df, numbers.Integral) else min_df * n_docs
+    if max_count < min_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+    return sorted(t for t, count in df.items() if min_count <= count <= max_count)
+
+
+def build_dtm(cleaned_texts, max_df=0.80, min_df=2, n_jobs=None, shard_size=2000, dtype=np.float32):
+    """
+    Document-term matrix equivalent to create_dtm, built in parallel shards:
+      1. each shard counts document frequencies; the counts are merged
+      2. terms are pruned by min_df / max_df on the merged counts
+      3. each shard is turned into CSR rows against the pruned vocabulary
+    Only the shards in flight and the merged frequency table live in
+    memory. The matrix uses int32 indices and a compact value dtype.
+
+    returns: (dtm, vectorizer) like create_dtm; the vectorizer has the
+    pruned vocabulary fixed so it can transform new text.
+    """
+    cleaned_texts = list(cleaned_texts)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    shards = list(_shards(cleaned_texts, shard_size))
+
+    parallel = n_jobs > 1 and len(shards) > 1
+
+    df = Counter()
+    if parallel:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            for shard_df in pool.map(_document_frequencies, shards):
+                df.update(shard_df)
+    else:
+        for shard in shards:
+            df.update(_document_frequencies(shard))
+
+    feature_names = _prune(df, len(cleaned_texts), min_df, max_df)
+    del df
+    vocabulary = {term: i for i, term in enumerate(feature_names)}
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_vocabulary,
+                                 initargs=(vocabulary,)) as pool:
+            blocks = list(pool.map(_count_shard, shards, [dtype] * len(shards)))
+    else:
+        _init_vocabulary(vocabulary)
+        blocks = [_count_shard(shard, dtype) for shard in shards]
+
+    dtm = sparse.vstack(blocks, format="csr") if blocks else \
+        sparse.csr_matrix((0, len(vocabulary)), dtype=dtype)
+    if dtm.nnz < np.iinfo(np.int32).max:
+        dtm.indptr = dtm.indptr.astype(np.int32)
+        dtm.indices = dtm.indices.astype(np.int32)
+
+    vectorizer = CountVectorizer(stop_words="english", vocabulary=vocabulary)
+    return dtm, vectorizer
+
+
+# ---------------- Persistence ----------------
+
+_CSR_PARTS = ("data", "indices", "indptr")
+
+
+def save_dtm(path, dtm, feature_names=None):
+    """
+    Saves a CSR matrix as an uncompressed .npz so load_dtm can memory-map
+    the arrays straight out of the archive.
+    """
+    dtm = sparse.csr_matrix(dtm)
+    arrays = {name: getattr(dtm, name) for name in _CSR_PARTS}
+    arrays["shape"] = np.asarray(dtm.shape, dtype=np.int64)
+    if feature_names is not None:
+        arrays["feature_names"] = np.asarray(feature_names, dtype=str)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez(path, **arrays)
+
+
+def _mmap_member(path, info):
+    # Uncompressed zip members are stored verbatim: skip the local file
+    # header and the .npy header, then map the raw array bytes.
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    return np.memmap(
+        path, dtype=dtype, mode="r", shape=shape, offset=offset,
+        order="F" if fortran_order else "C"
+    )
+
+
+def load_dtm(path, mmap=True):
+    """
+    Loads a matrix written by save_dtm. With mmap=True the CSR buffers are
+    memory-mapped read-only instead of read into RAM.
+    returns: (dtm, feature_names or None)
+    """
+    with np.load(path) as archive:
+        shape = tuple(archive["shape"])
+        feature_names = archive["feature_names"] if "feature_names" in archive.files else None
+        if not mmap:
+            parts = [archive[name] for name in _CSR_PARTS]
+
+    if mmap:
+        with zipfile.ZipFile(path) as zf:
+            infos = [zf.getinfo(f"{name}.npy") for name in _CSR_PARTS]
+        if all(info.compress_type == zipfile.ZIP_STORED for info in infos):
+            parts = [_mmap_member(path, info) for info in infos]
+        else:
+            with np.load(path) as archive:
+                parts = [archive[name] for name in _CSR_PARTS]
+
+    dtm = sparse.csr_matrix(tuple(parts), shape=shape, copy=False)
+    return dtm, feature_names
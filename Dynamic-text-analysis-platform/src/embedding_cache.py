@@ -0,0 +1,144 @@
+# src/embedding_cache.py
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from src.model_loader import SENTENCE_MODEL
+
+EMBEDDING_CACHE_DIR = "outputs/models/embedding_cache"
+_KEY_BYTES = 16
+
+
+def sentence_key(sentence):
+    """
+    Content hash of a sentence after case / whitespace normalization, so
+    trivially different copies of the same sentence share one embedding.
+    """
+    normalized = " ".join(sentence.lower().split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=_KEY_BYTES).digest()
+
+
+class EmbeddingCache:
+    """
+    Persistent sentence-embedding store. Vectors live in an append-only
+    float16 file that is read through a memory map; keys.bin holds the
+    content hash of each row in the same order, so the index is rebuilt
+    on load and new entries are simply appended on disk. A cache written
+    by a different encoder model is discarded.
+    """
+
+    def __init__(self, directory=EMBEDDING_CACHE_DIR, model_name=SENTENCE_MODEL):
+        self.directory = directory
+        self.model_name = model_name
+        self.keys_path = os.path.join(directory, "keys.bin")
+        self.vectors_path = os.path.join(directory, "vectors.f16")
+        self.meta_path = os.path.join(directory, "meta.json")
+
+        self.dim = None
+        self.n_rows = 0
+        self.index = {}
+        self.hits = 0
+        self.misses = 0
+        self._vectors = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta.get("model") == model_name:
+                self.dim = meta["dim"]
+                self._load_index()
+            else:
+                self._reset()
+
+    def _reset(self):
+        # Vectors from another encoder live in a different space
+        for path in (self.meta_path, self.keys_path, self.vectors_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _load_index(self):
+        if not os.path.exists(self.keys_path):
+            return
+        with open(self.keys_path, "rb") as f:
+            keys = f.read()
+
+        # Trust only rows whose key and vector were both fully written, and
+        # cut any torn tail off both files so appends stay row-aligned
+        row_bytes = self.dim * 2
+        n_rows = min(
+            len(keys) // _KEY_BYTES,
+            os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        )
+        os.truncate(self.keys_path, n_rows * _KEY_BYTES)
+        if os.path.exists(self.vectors_path):
+            os.truncate(self.vectors_path, n_rows * row_bytes)
+
+        self.n_rows = n_rows
+        for row in range(n_rows):
+            self.index[keys[row * _KEY_BYTES:(row + 1) * _KEY_BYTES]] = row
+
+    def _view(self):
+        if self._vectors is None or len(self._vectors) < self.n_rows:
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float16, mode="r",
+                shape=(self.n_rows, self.dim)
+            )
+        return self._vectors
+
+    def _append(self, keys, vectors):
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.meta_path, "w") as f:
+                json.dump({"dim": self.dim, "model": self.model_name}, f)
+
+        # Vectors first: a crash in between leaves an orphan vector, which
+        # _load_index trims, never a key pointing at nothing
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.keys_path, "ab") as f:
+            f.write(b"".join(keys))
+
+        start = self.n_rows
+        for offset, key in enumerate(keys):
+            self.index[key] = start + offset
+        self.n_rows += len(keys)
+
+    def encode(self, sentences, encode_fn, **encode_kwargs):
+        """
+        Returns float32 embeddings for sentences, calling encode_fn only
+        for sentences whose normalized content has never been seen.
+        """
+        keys = [sentence_key(s) for s in sentences]
+
+        with self._lock:
+            pending = {}
+            for key, sentence in zip(keys, sentences):
+                if key not in self.index and key not in pending:
+                    pending[key] = sentence
+
+            self.misses += len(pending)
+            self.hits += len(keys) - len(pending)
+
+            if pending:
+                new_vectors = encode_fn(list(pending.values()), **encode_kwargs)
+                self._append(list(pending), new_vectors)
+
+            if not keys:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            rows = [self.index[key] for key in keys]
+            return np.asarray(self._view()[rows], dtype=np.float32)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,75 @@
+import os
+import torch
+from transformers import (
+    AutoModelForSeq2SeqLM,
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    pipeline
+)
+
+# "pytorch"   – full-precision PyTorch (default)
+# "quantized" – PyTorch with int8 dynamic quantization of Linear layers
+# "onnx"      – ONNX Runtime export (needs optimum[onnxruntime])
+BACKENDS = ("pytorch", "quantized", "onnx")
+INFERENCE_BACKEND = os.environ.get("TEXT_ANALYSIS_BACKEND", "pytorch").lower()
+ONNX_EXPORT_DIR = "outputs/models/onnx"
+
+_TASK_CLASSES = {
+    "sentiment-analysis": AutoModelForSequenceClassification,
+    "summarization": AutoModelForSeq2SeqLM
+}
+
+
+def get_backend(backend=None):
+    backend = (backend or INFERENCE_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}'. Choose from {BACKENDS}.")
+    return backend
+
+
+def _load_onnx_model(task, model_name):
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError(
+            "The 'onnx' backend needs optimum with ONNX Runtime: "
+            "pip install optimum[onnxruntime]"
+        ) from e
+
+    ort_class = ORTModelForSeq2SeqLM if task == "summarization" else ORTModelForSequenceClassification
+
+    # Export once, then reuse the saved graph on later runs
+    export_path = os.path.join(ONNX_EXPORT_DIR, model_name.replace("/", "__"))
+    if os.path.isdir(export_path):
+        return ort_class.from_pretrained(export_path)
+
+    model = ort_class.from_pretrained(model_name, export=True)
+    os.makedirs(export_path, exist_ok=True)
+    model.save_pretrained(export_path)
+    return model
+
+
+def load_model(task, model_name, backend=None):
+    """
+    Returns (tokenizer, model) for a Hugging Face task using the selected
+    CPU inference backend.
+    """
+    if task not in _TASK_CLASSES:
+        raise ValueError(f"Unsupported task '{task}'. Choose from {tuple(_TASK_CLASSES)}.")
+    backend = get_backend(backend)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    if backend == "onnx":
+        return tokenizer, _load_onnx_model(task, model_name)
+
+    model = _TASK_CLASSES[task].from_pretrained(model_name)
+    model.eval()
+    if backend == "quantized":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return tokenizer, model
+
+
+def build_pipeline(task, model_name, backend=None):
+    tokenizer, model = load_model(task, model_name, backend)
+    return pipeline(task, model=model, tokenizer=tokenizer, device=-1)
@@ -1,13 +1,95 @@
 # src/input_handler.py
+import codecs
+import mmap
 import os
 
-def load_texts(data_path="data/raw"):
-    texts = []
+# Files at or above this size are read through a memory map, decoded
+# incrementally and yielded as several records of about CHUNK_CHARS
+# characters, so memory is bounded by one chunk instead of the file.
+MMAP_THRESHOLD = 8 * 1024 * 1024
+CHUNK_CHARS = 1024 * 1024
+
+
+def _read_file(file_path):
+    with open(file_path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def iter_file_chunks(file_path, chunk_chars=CHUNK_CHARS):
+    """
+    Decodes a file incrementally from a memory map and yields pieces of
+    about chunk_chars characters, each cut after the last whitespace so
+    no word is split.
+    """
+    if os.path.getsize(file_path) == 0:
+        return
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_chars):
+                pending += decoder.decode(mapped[start:start + chunk_chars])
+                if len(pending) < chunk_chars:
+                    continue
+                cut = max(pending.rfind(" "), pending.rfind("\n")) + 1 or len(pending)
+                yield pending[:cut]
+                pending = pending[cut:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_documents(data_path="data/raw", extension=".txt", recursive=True,
+                   mmap_threshold=MMAP_THRESHOLD, skip_ids=None, chunk_chars=CHUNK_CHARS):
+    """
+    Lazily yields (doc_id, text) records for every matching file under
+    data_path. doc_id is the path relative to data_path, so documents in
+    nested folders stay distinguishable. Files are visited in sorted order.
+    Files of mmap_threshold bytes or more are yielded in parts as
+    ("<doc_id>#<n>", text) records. Files whose doc_id (or, for a file
+    read in parts, "<doc_id>#0") is in skip_ids are not read at all.
+    """
+    for root, dirs, files in os.walk(data_path):
+        dirs.sort()
+        if not recursive:
+            dirs[:] = []
 
-    for filename in sorted(os.listdir(data_path)):
-        if filename.endswith(".txt"):
-            file_path = os.path.join(data_path, filename)
-            with open(file_path, "r", encoding="utf-8") as file:
-                texts.append(file.read())
+        for filename in sorted(files):
+            if not filename.endswith(extension):
+                continue
+            file_path = os.path.join(root, filename)
+            doc_id = os.path.relpath(file_path, data_path)
+            if os.path.getsize(file_path) < mmap_threshold:
+                if not (skip_ids and doc_id in skip_ids):
+                    yield doc_id, _read_file(file_path)
+                continue
+            if skip_ids and f"{doc_id}#0" in skip_ids:
+                continue
+            for part, text in enumerate(iter_file_chunks(file_path, chunk_chars)):
+                yield f"{doc_id}#{part}", text
 
-    return texts
+
+def iter_batches(records, batch_size=256):
+    """
+    Groups any iterable of records into lists of at most batch_size items.
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def stream_texts(data_path="data/raw", batch_size=256, **kwargs):
+    """
+    Streams the corpus as batches of (doc_id, text) records, so only one
+    batch needs to be held in memory at a time.
+    """
+    yield from iter_batches(iter_documents(data_path, **kwargs), batch_size)
+
+
+def load_texts(data_path="data/raw"):
+    return [text for _, text in iter_documents(data_path, recursive=False)]
@@ -108,6 +108,7 @@ def train_logistic_model(csv_path="data/sentiment_train.csv"):
 
 
 import pandas as pd
+import numpy as np
 import joblib
 import os
 
@@ -154,32 +155,65 @@ def train_logistic_model(csv_path="data/sentiment_train.csv"):
     joblib.dump(vectorizer, VECTORIZER_PATH)
     joblib.dump(encoder, ENCODER_PATH)
 
+    # Drop any artifacts cached before retraining
+    global _logistic_artifacts
+    _logistic_artifacts = None
+
     print("✅ Logistic Regression trained & saved successfully")
 
 
 # ==========================
-# 🔹 PREDICTION FUNCTION
+# 🔹 MODEL HOLDER (loaded once)
 # ==========================
-def logistic_sentiment(text):
-    model = joblib.load(MODEL_PATH)
-    vectorizer = joblib.load(VECTORIZER_PATH)
-    encoder = joblib.load(ENCODER_PATH)
+_logistic_artifacts = None
+
+def get_logistic_artifacts():
+    global _logistic_artifacts
+    if _logistic_artifacts is None:
+        _logistic_artifacts = (
+            joblib.load(MODEL_PATH),
+            joblib.load(VECTORIZER_PATH),
+            joblib.load(ENCODER_PATH)
+        )
+    return _logistic_artifacts
+
+
+EMOJI_MAP = {
+    "Positive": "Positive 😊",
+    "Neutral": "Neutral 😐",
+    "Negative": "Negative 😞"
+}
+
 
-    X_vec = vectorizer.transform([text])
+# ==========================
+# 🔹 PREDICTION FUNCTIONS
+# ==========================
+def logistic_sentiment_batch(texts):
+    """
+    Scores a batch of texts with one sparse transform and one
+    predict_proba call. Returns columnar NumPy arrays:
+    {"labels": [...], "sentiment": [...], "confidence": [...]}
+    """
+    model, vectorizer, encoder = get_logistic_artifacts()
 
-    pred_encoded = model.predict(X_vec)[0]
-    probs = model.predict_proba(X_vec)[0]
+    X_vec = vectorizer.transform(list(texts))
+    probs = model.predict_proba(X_vec)
 
-    label = encoder.inverse_transform([pred_encoded])[0]
+    best = probs.argmax(axis=1)
+    labels = encoder.inverse_transform(model.classes_[best])
 
-    emoji_map = {
-        "Positive": "Positive 😊",
-        "Neutral": "Neutral 😐",
-        "Negative": "Negative 😞"
+    return {
+        "labels": labels,
+        "sentiment": np.array([EMOJI_MAP[label] for label in labels]),
+        "confidence": probs[np.arange(len(best)), best]
     }
 
+
+def logistic_sentiment(text):
+    result = logistic_sentiment_batch([text])
+
     return {
         "model": "Logistic Regression",
-        "sentiment": emoji_map[label],
-        "confidence": float(max(probs))
+        "sentiment": str(result["sentiment"][0]),
+        "confidence": float(result["confidence"][0])
     }
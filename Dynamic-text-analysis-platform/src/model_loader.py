@@ -1,14 +1,90 @@
-from transformers import pipeline
+import threading
+import time
+
+DISTILBART_MODEL = "sshleifer/distilbart-cnn-12-6"
+DISTILBERT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+SENTENCE_MODEL = "all-MiniLM-L6-v2"
+
+# name -> zero-argument factory; models are built on first get_model()
+_factories = {}
+_models = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def register_model(name, factory):
+    with _registry_lock:
+        _factories[name] = factory
+        _locks.setdefault(name, threading.Lock())
+
+
+def get_model(name):
+    """
+    Returns the named model, building it on first use. Safe to call from
+    several threads: each model is built exactly once.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _factories:
+        raise KeyError(f"No model registered under '{name}'. Known: {sorted(_factories)}")
+
+    with _locks[name]:
+        model = _models.get(name)
+        if model is None:
+            model = _factories[name]()
+            _models[name] = model
+    return model
+
+
+def is_loaded(name):
+    return name in _models
+
+
+def warmup(names=None):
+    """
+    Loads the given models (all registered ones by default) up front and
+    returns the seconds spent on each.
+    """
+    timings = {}
+    for name in names or list(_factories):
+        start = time.perf_counter()
+        get_model(name)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+# ---------------- Factories ----------------
+# Heavy libraries are imported inside the factories so importing this
+# module (or anything that uses it) stays cheap.
+
+def _load_distilbart():
+    from src.inference_backend import build_pipeline
+    print("🔄 Loading DistilBART model (once only)...")
+    return build_pipeline("summarization", DISTILBART_MODEL)
+
+
+def _load_distilbert_sentiment():
+    from src.inference_backend import build_pipeline
+    return build_pipeline("sentiment-analysis", DISTILBERT_MODEL)
+
+
+def _load_sentence_encoder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(SENTENCE_MODEL)
+
+
+def _load_vader():
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+register_model("distilbart", _load_distilbart)
+register_model("distilbert_sentiment", _load_distilbert_sentiment)
+register_model("sentence_encoder", _load_sentence_encoder)
+register_model("vader", _load_vader)
 
-_bart_model = None
 
 def get_distilbart():
-    global _bart_model
-    if _bart_model is None:
-        print("🔄 Loading DistilBART model (once only)...")
-        _bart_model = pipeline(
-            "summarization",
-            model="sshleifer/distilbart-cnn-12-6",
-            device=-1
-        )
-    return _bart_model
+    return get_model("distilbart")
@@ -0,0 +1,106 @@
+# src/online_lda.py
+import os
+import joblib
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+
+
+class OnlineTopicModel:
+    """
+    Incremental LDA for streaming corpora. Documents are vectorized with a
+    fixed vocabulary (e.g. the one saved by main.py) or, when none is
+    given, a stateless HashingVectorizer, so no pass over the full corpus
+    is ever needed. Each batch updates the model with partial_fit.
+    """
+
+    def __init__(self, n_topics=5, vocabulary=None, n_features=2 ** 18,
+                 batch_size=128, learning_decay=0.7, learning_offset=10.0,
+                 total_samples=1e6, random_state=42):
+        if vocabulary is not None:
+            self.vectorizer = CountVectorizer(vocabulary=vocabulary)
+        else:
+            self.vectorizer = HashingVectorizer(
+                n_features=n_features,
+                alternate_sign=False,
+                norm=None,
+                stop_words="english"
+            )
+
+        self.lda = LatentDirichletAllocation(
+            n_components=n_topics,
+            learning_method="online",
+            batch_size=batch_size,
+            learning_decay=learning_decay,
+            learning_offset=learning_offset,
+            total_samples=total_samples,
+            random_state=random_state
+        )
+        self.n_docs_seen = 0
+        self.n_batches_seen = 0
+        # doc_ids already trained on, so a resumed stream skips them
+        self.seen_doc_ids = set()
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer, **kwargs):
+        """Reuses the vocabulary of an already fitted CountVectorizer."""
+        return cls(vocabulary=vectorizer.vocabulary_, **kwargs)
+
+    def partial_fit(self, cleaned_texts):
+        dtm = self.vectorizer.transform(cleaned_texts)
+        self.lda.partial_fit(dtm)
+        self.n_docs_seen += dtm.shape[0]
+        self.n_batches_seen += 1
+        return self
+
+    def fit_stream(self, batches, preprocess=None, checkpoint_path=None, checkpoint_every=10):
+        """
+        Consumes an iterable of document batches. A batch is a list of
+        texts or of (doc_id, text) records, as produced by
+        src.input_handler.stream_texts. Records whose doc_id was already
+        trained on are skipped, and new doc_ids are saved with the
+        checkpoint. `preprocess` maps a list of raw texts to cleaned texts
+        (e.g. a PreprocessPool). The model is checkpointed every
+        `checkpoint_every` batches and at the end.
+        """
+        for batch in batches:
+            records = [r for r in batch if not (isinstance(r, tuple) and r[0] in self.seen_doc_ids)]
+            if not records:
+                continue
+            texts = [r[1] if isinstance(r, tuple) else r for r in records]
+            if preprocess is not None:
+                texts = preprocess(texts)
+            self.partial_fit(texts)
+            self.seen_doc_ids.update(r[0] for r in records if isinstance(r, tuple))
+
+            if checkpoint_path and self.n_batches_seen % checkpoint_every == 0:
+                self.save(checkpoint_path)
+
+        if checkpoint_path:
+            self.save(checkpoint_path)
+        return self
+
+    def transform(self, cleaned_texts):
+        return self.lda.transform(self.vectorizer.transform(cleaned_texts))
+
+    def feature_names(self):
+        if isinstance(self.vectorizer, HashingVectorizer):
+            raise ValueError("Hashed features have no names; build the model with a vocabulary.")
+        return self.vectorizer.get_feature_names_out()
+
+    @property
+    def components_(self):
+        return self.lda.components_
+
+    def save(self, path):
+        # Write to a temp file first so a crash never leaves a torn checkpoint
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        model = joblib.load(path)
+        if not hasattr(model, "seen_doc_ids"):   # checkpoint from before doc_id tracking
+            model.seen_doc_ids = set()
+        return model
@@ -1,37 +1,249 @@
-import re
+import os
+import pickle
+import threading
 import nltk
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 
+from src.text_cleaning import normalize_for_topics
+
 
 stop_words = set(stopwords.words("english"))
 lemmatizer = WordNetLemmatizer()
 
-def preprocess_text(text):
-    # 1. Lowercase
-    text = text.lower()
+custom_stopwords = {
+    'org', 'care', 'provide', 'email', 'used','like','world','update','expert'
+}
 
-    # 2. Remove URLs
-    text = re.sub(r"http\S+|www\S+", "", text)
 
-    # 3. Remove special characters, numbers, emojis
-    text = re.sub(r"[^a-zA-Z\s]", " ", text)
+class TokenCache:
+    """
+    Bounded LRU map from a raw token to its lemma, or to None when the
+    token is dropped by the stopword / length filter. Safe to share
+    between threads (Streamlit sessions use the module-level instance).
+    """
 
-    custom_stopwords = {
-    'org', 'care', 'provide', 'email', 'used','like','world','update','expert'
-}
+    def __init__(self, maxsize=200_000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Entries added since the last take_changes(); only tracked in
+        # pool workers, whose caches are merged back into the parent
+        self._changes = None
+        self._lock = threading.Lock()
+
+    def lookup(self, token):
+        with self._lock:
+            try:
+                value = self._data[token]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(token)
+                return value
+
+        # Lemmatize outside the lock so threads don't queue behind WordNet
+        value = _normalize_token(token)
+        with self._lock:
+            self._data[token] = value
+            if self._changes is not None:
+                self._changes[token] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def track_changes(self):
+        self._changes = {}
+
+    def take_changes(self):
+        """
+        New entries and hit / miss counts since the previous call, then
+        resets them. Used to ship a worker's work back to the parent.
+        """
+        changes = {
+            "entries": self._changes or {},
+            "hits": self.hits,
+            "misses": self.misses
+        }
+        self._changes = {}
+        self.hits = 0
+        self.misses = 0
+        return changes
+
+    def merge(self, changes):
+        with self._lock:
+            for token, value in changes["entries"].items():
+                self._data[token] = value
+                self._data.move_to_end(token)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            self.hits += changes["hits"]
+            self.misses += changes["misses"]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            entries = dict(self._data)
+        with open(path, "wb") as f:
+            pickle.dump(entries, f)
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            entries = pickle.load(f)
+        with self._lock:
+            for token, value in entries.items():
+                self._data[token] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def _normalize_token(token):
+    if token in stop_words or token in custom_stopwords or len(token) <= 2:
+        return None
+    return lemmatizer.lemmatize(token)
+
+
+token_cache = TokenCache()
+
+
+def cache_stats():
+    return token_cache.stats()
+
+
+TOKEN_CACHE_PATH = "outputs/models/token_cache.pkl"
+
+
+def save_token_cache(path=TOKEN_CACHE_PATH):
+    token_cache.save(path)
+
+
+def load_token_cache(path=TOKEN_CACHE_PATH):
+    if os.path.exists(path):
+        token_cache.load(path)
+
+
+def lemmatize_tokens(tokens):
+    # 5-6. Remove stopwords and short words, lemmatize (memoized)
+    lookup = token_cache.lookup
+    return [lemma for lemma in map(lookup, tokens) if lemma is not None]
+
+
+def preprocess_text(text):
+    # 1-3. Lowercase, remove URLs, special characters, numbers, emojis
+    text = normalize_for_topics(text)
 
     # 4. Tokenization
     tokens = word_tokenize(text)
 
-    # 5. Remove stopwords and short words
-    tokens = [t for t in tokens if t not in stop_words and t not in custom_stopwords and len(t) > 2]
-
-    # 6. Lemmatization
-    tokens = [lemmatizer.lemmatize(t) for t in tokens]
+    # 5-6. Remove stopwords and short words, lemmatize (memoized)
+    tokens = lemmatize_tokens(tokens)
 
     # 7. Convert tokens back to text
     clean_text = " ".join(tokens)
 
     return clean_text
+
+
+def _init_worker(cache_path=None):
+    # stop_words and lemmatizer are built once per worker when this module
+    # is imported; WordNet itself loads lazily, so touch it here instead of
+    # inside the first task.
+    lemmatizer.lemmatize("warmup")
+    if cache_path:
+        load_token_cache(cache_path)
+    token_cache.track_changes()
+    token_cache.take_changes()   # the loaded entries are already in the parent
+
+
+def _preprocess_chunk(texts):
+    # Runs in a worker: results plus what this chunk added to its cache
+    return [preprocess_text(t) for t in texts], token_cache.take_changes()
+
+
+def _map_chunks(pool, texts, chunksize):
+    chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+    cleaned = []
+    for outputs, changes in pool.map(_preprocess_chunk, chunks):
+        cleaned.extend(outputs)
+        token_cache.merge(changes)
+    return cleaned
+
+
+class PreprocessPool:
+    """
+    Long-lived preprocess_corpus for streams of batches: one process pool
+    (and one WordNet load per worker) serves every call. Use as a context
+    manager; calling it maps a list of raw texts to cleaned texts.
+    """
+
+    def __init__(self, n_jobs=None, chunksize=64, cache_path=None):
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.cache_path = cache_path
+        self._pool = None
+        if cache_path:
+            load_token_cache(cache_path)
+
+    def __call__(self, texts):
+        texts = list(texts)
+        if self.n_jobs <= 1 or len(texts) <= self.chunksize:
+            return [preprocess_text(t) for t in texts]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                             initargs=(self.cache_path,))
+        return _map_chunks(self._pool, texts, self.chunksize)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def preprocess_corpus(texts, n_jobs=None, chunksize=64, cache_path=None):
+    """
+    Runs preprocess_text over a whole corpus using a process pool.
+    Output order matches input order. n_jobs=None uses every core,
+    n_jobs=1 (or a corpus smaller than one chunk) stays in-process.
+    cache_path seeds the token cache (the parent's and every worker's)
+    from a saved file; entries the workers add are merged back into the
+    parent cache, so save_token_cache / cache_stats see all of them.
+    """
+    texts = list(texts)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if cache_path:
+        load_token_cache(cache_path)
+
+    if n_jobs <= 1 or len(texts) <= chunksize:
+        return [preprocess_text(t) for t in texts]
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(cache_path,)) as pool:
+        return _map_chunks(pool, texts, chunksize)
@@ -1,49 +1,263 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import KMeans
+import os
+
+import joblib
+from sklearn.cluster import AgglomerativeClustering, KMeans, MiniBatchKMeans
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 import nltk
 
+from src.embedding_cache import EmbeddingCache
+from src.model_loader import get_model
+
+CORPUS_BATCH_SIZE = 256
+
+# "auto" clustering: agglomerative up to SMALL_DOC_SENTENCES sentences,
+# MiniBatchKMeans from LARGE_DOC_SENTENCES, single-init KMeans++ between
+SMALL_DOC_SENTENCES = 50
+LARGE_DOC_SENTENCES = 2000
+CLUSTER_BACKENDS = ("auto", "agglomerative", "kmeans", "minibatch", "kmeans_n10")
+
+# Corpus-global topics: centroids fitted once by main.py, saved next to
+# the LDA artifacts and shared by every later request
+SEMANTIC_MODEL_PATH = "models/semantic_centroids.pkl"
+GLOBAL_N_TOPICS = 8
+
+_embedding_cache = None
+_global_topics = None
+
+
+def get_embedding_cache():
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
 
+def encode_sentences(sentences, **encode_kwargs):
+    # Only sentences never seen before (after normalization) hit the model
+    return get_embedding_cache().encode(
+        sentences, get_model("sentence_encoder").encode, **encode_kwargs
+    )
+
+
+def semantic_topic_scores(text, n_topics=3, use_global=True, context=None):
+    # 1. Split into sentences (shared with the other analyzers via context)
+    sentences = context.sentences if context is not None else nltk.sent_tokenize(text)
+
+    # Saved corpus centroids make this a lookup instead of a clustering job
+    model = get_global_topics() if use_global else None
+    if model is not None and sentences:
+        return global_topic_scores(encode_sentences(sentences), model)
 
-def semantic_topic_scores(text, n_topics=3):
-    # 1. Split into sentences
-    sentences = nltk.sent_tokenize(text)
     if len(sentences) < 2:
         return {"General": 1.0}
 
     # 2. Encode sentences
-    embeddings = model.encode(sentences)
+    embeddings = encode_sentences(sentences)
 
-    # 3. Decide clusters automatically
-    k = min(n_topics, len(sentences))
-    kmeans = KMeans(n_clusters=k, n_init=10, random_state=42)
-    labels = kmeans.fit_predict(embeddings)
+    return cluster_topic_scores(sentences, embeddings, n_topics)
 
-    # 4. Group sentences by cluster
-    clusters = {}
-    for i, label in enumerate(labels):
-        clusters.setdefault(label, []).append(sentences[i])
 
-    # 5. Extract topic names using TF-IDF
-    vectorizer = TfidfVectorizer(stop_words="english", max_features=4)
-    topic_scores = {}
+def _encode_corpus(doc_sentences, batch_size, min_sentences=2):
+    flat, offsets = [], [0]
+    for sentences in doc_sentences:
+        if len(sentences) >= min_sentences:
+            flat.extend(sentences)
+        offsets.append(len(flat))
+
+    embeddings = None
+    if flat:
+        # Similar lengths in a batch means little padding per forward pass
+        order = np.argsort([len(s) for s in flat], kind="stable")
+        sorted_embeddings = encode_sentences([flat[i] for i in order], batch_size=batch_size)
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+
+    return flat, offsets, embeddings
+
+
+def semantic_topic_scores_corpus(texts, n_topics=3, batch_size=CORPUS_BATCH_SIZE, model=None):
+    """
+    Corpus mode: sentence-splits every document up front, encodes all
+    sentences together in large length-sorted batches, then scatters the
+    embeddings back and clusters / names each document as usual.
+    With a global model every sentence is assigned to its nearest corpus
+    centroid instead, so labels mean the same thing across documents.
+    Returns one score dict per text, in input order.
+    """
+    doc_sentences = [nltk.sent_tokenize(text) for text in texts]
+
+    if model is not None:
+        _, offsets, embeddings = _encode_corpus(doc_sentences, batch_size, min_sentences=1)
+        labels = assign_topics(embeddings, model) if embeddings is not None else None
+        return [
+            _label_scores(labels[start:end], model["names"]) if end > start else {"General": 1.0}
+            for start, end in zip(offsets, offsets[1:])
+        ]
+
+    _, offsets, embeddings = _encode_corpus(doc_sentences, batch_size)
+
+    results = []
+    for doc_idx, sentences in enumerate(doc_sentences):
+        if len(sentences) < 2:
+            results.append({"General": 1.0})
+            continue
+        start, end = offsets[doc_idx], offsets[doc_idx + 1]
+        results.append(cluster_topic_scores(sentences, embeddings[start:end], n_topics))
+
+    return results
+
+
+def cluster_sentences(embeddings, k, backend="auto"):
+    """
+    Returns a cluster label per sentence embedding.
+      agglomerative – average-linkage on cosine distance, cheap for small n
+      kmeans        – KMeans with a single k-means++ init
+      minibatch     – MiniBatchKMeans for very long documents
+      kmeans_n10    – the original KMeans(n_init=10), kept for comparison
+    """
+    n = len(embeddings)
+    if backend == "auto":
+        if n <= SMALL_DOC_SENTENCES:
+            backend = "agglomerative"
+        elif n >= LARGE_DOC_SENTENCES:
+            backend = "minibatch"
+        else:
+            backend = "kmeans"
+
+    if backend == "agglomerative":
+        model = AgglomerativeClustering(n_clusters=k, metric="cosine", linkage="average")
+    elif backend == "kmeans":
+        model = KMeans(n_clusters=k, init="k-means++", n_init=1, random_state=42)
+    elif backend == "minibatch":
+        model = MiniBatchKMeans(n_clusters=k, n_init=1, batch_size=1024, random_state=42)
+    elif backend == "kmeans_n10":
+        model = KMeans(n_clusters=k, n_init=10, random_state=42)
+    else:
+        raise ValueError(f"Unknown clustering backend '{backend}'. Choose from {CLUSTER_BACKENDS}.")
+
+    return model.fit_predict(embeddings)
+
 
-    for label, group in clusters.items():
-        tfidf = vectorizer.fit_transform(group)
-        words = vectorizer.get_feature_names_out()
-        scores = tfidf.toarray().sum(axis=0)
+def name_clusters(sentences, labels, n_words=3):
+    """
+    Names every cluster from a single TF-IDF fit over the document's
+    sentences: a cluster's name is its n_words highest summed TF-IDF
+    terms. returns: {label: name}
+    """
+    labels = np.asarray(labels)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    try:
+        tfidf = vectorizer.fit_transform(sentences)
+    except ValueError:   # only stopwords / no tokens
+        return {label: "General" for label in np.unique(labels)}
+    words = vectorizer.get_feature_names_out()
 
-        top_words = [words[i] for i in scores.argsort()[-3:]]
-        topic_name = " ".join(top_words).title()
+    names = {}
+    for label in np.unique(labels):
+        scores = np.asarray(tfidf[labels == label].sum(axis=0)).ravel()
+        n = min(n_words, np.count_nonzero(scores))
+        if n == 0:
+            names[label] = "General"
+            continue
+        top = np.argpartition(scores, -n)[-n:]
+        top = top[np.argsort(scores[top], kind="stable")]   # ascending, as before
+        names[label] = " ".join(words[i] for i in top).title()
+    return names
 
-        topic_scores[topic_name] = len(group)
+
+def cluster_topic_scores(sentences, embeddings, n_topics=3, backend="auto"):
+    # 3. Decide clusters automatically
+    k = min(n_topics, len(sentences))
+    labels = cluster_sentences(embeddings, k, backend)
+
+    # 4-5. Name each cluster using one TF-IDF fit for the document
+    names = name_clusters(sentences, labels)
+    topic_scores = {}
+    for label, count in zip(*np.unique(labels, return_counts=True)):
+        topic_name = names[label]
+        topic_scores[topic_name] = topic_scores.get(topic_name, 0) + int(count)
 
     # 6. Normalize to probabilities
     total = sum(topic_scores.values())
     for k in topic_scores:
         topic_scores[k] /= total
 
-    return topic_scores
\ No newline at end of file
+    return topic_scores
+
+
+# ---------------- Corpus-global topics ----------------
+
+def _normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def fit_global_topics(texts, n_topics=GLOBAL_N_TOPICS, batch_size=CORPUS_BATCH_SIZE, backend="auto"):
+    """
+    Clusters every sentence of the corpus once and keeps the unit-length
+    centroids plus a TF-IDF name per centroid.
+    returns: {"centroids": (k, dim) float32, "names": [name per centroid]}
+    """
+    doc_sentences = [nltk.sent_tokenize(text) for text in texts]
+    sentences, _, embeddings = _encode_corpus(doc_sentences, batch_size, min_sentences=1)
+    if not sentences:
+        raise ValueError("No sentences to fit semantic topics on.")
+
+    embeddings = _normalize_rows(embeddings)
+    k = min(n_topics, len(sentences))
+    if backend == "auto":
+        # Agglomerative is quadratic in the sentence count; fine per
+        # document, not for a whole corpus
+        backend = "minibatch" if len(sentences) >= LARGE_DOC_SENTENCES else "kmeans"
+    labels = cluster_sentences(embeddings, k, backend)
+
+    present = np.unique(labels)
+    centroids = np.vstack([embeddings[labels == label].mean(axis=0) for label in present])
+    names = name_clusters(sentences, labels)
+    return {
+        "centroids": _normalize_rows(centroids),
+        "names": [names[label] for label in present]
+    }
+
+
+def save_global_topics(model, path=SEMANTIC_MODEL_PATH):
+    global _global_topics
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    joblib.dump(model, path)
+    _global_topics = model
+
+
+def get_global_topics(path=SEMANTIC_MODEL_PATH):
+    """
+    Saved corpus centroids, loaded once; None when main.py hasn't
+    produced them yet (callers then cluster per document).
+    """
+    global _global_topics
+    if _global_topics is None and os.path.exists(path):
+        _global_topics = joblib.load(path)
+    return _global_topics
+
+
+def assign_topics(embeddings, model):
+    # Cosine similarity to every centroid in one matmul
+    similarities = _normalize_rows(embeddings) @ model["centroids"].T
+    return similarities.argmax(axis=1)
+
+
+def _label_scores(labels, names):
+    counts = np.bincount(labels, minlength=len(names))
+    topic_scores = {}
+    for label in np.flatnonzero(counts):
+        topic_scores[names[label]] = topic_scores.get(names[label], 0) + int(counts[label])
+
+    total = sum(topic_scores.values())
+    return {name: count / total for name, count in topic_scores.items()}
+
+
+def global_topic_scores(embeddings, model):
+    """
+    Share of a document's sentences closest to each corpus topic.
+    """
+    return _label_scores(assign_topics(embeddings, model), model["names"])
@@ -1,16 +1,75 @@
-from transformers import pipeline
+import os
+import numpy as np
 
-# Load once
-sentiment_pipeline = pipeline(
-    "sentiment-analysis",
-    model="distilbert-base-uncased-finetuned-sst-2-english"
-)
+from src.model_loader import DISTILBERT_MODEL, get_model
 
-def distilbert_sentiment(text):
-    result = sentiment_pipeline(text[:512])[0]
+MODEL_NAME = DISTILBERT_MODEL
+MAX_TOKENS = 512
+BATCH_SIZE = 32
+# Tokens shared by consecutive windows in "window" mode
+WINDOW_OVERLAP = 128
+REDUCERS = ("mean", "weighted", "max")
+# 0 = torch's default (one intra-op thread per physical core), limited to
+# the CPUs available to this process
+NUM_THREADS = int(os.environ.get("DISTILBERT_NUM_THREADS", "0"))
 
-    label = result["label"]          # POSITIVE / NEGATIVE
-    score = result["score"]          # confidence (0–1)
+_threads_configured = False
+
+
+def _available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _configure_threads():
+    # Never run more intra-op threads than physical cores we can actually
+    # use. sched_getaffinity counts hyperthreads, so it only narrows
+    # torch's physical-core default and never raises it.
+    global _threads_configured
+    if _threads_configured:
+        return
+    import torch
+    cores = min(_available_cores(), torch.get_num_threads())
+    threads = min(NUM_THREADS, cores) if NUM_THREADS > 0 else cores
+    torch.set_num_threads(threads)
+    _threads_configured = True
+
+
+def _predict_token_ids(input_ids, batch_size=BATCH_SIZE):
+    """
+    Runs already tokenized inputs through the model. Inputs are sorted
+    by length so each batch is padded only to its own longest sequence,
+    then probabilities are scattered back to input order.
+    """
+    import torch
+
+    _configure_threads()
+    sentiment_pipeline = get_model("distilbert_sentiment")
+    tokenizer = sentiment_pipeline.tokenizer
+    model = sentiment_pipeline.model
+
+    order = sorted(range(len(input_ids)), key=lambda i: len(input_ids[i]))
+    probs = np.zeros((len(input_ids), model.config.num_labels), dtype=np.float32)
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            batch = tokenizer.pad(
+                {"input_ids": [input_ids[i] for i in idx]},
+                return_tensors="pt"
+            )
+            logits = model(**batch).logits
+            probs[idx] = torch.softmax(logits, dim=-1).numpy()
+
+    return probs
+
+
+def _to_result(prob_row):
+    id2label = get_model("distilbert_sentiment").model.config.id2label
+    best = int(prob_row.argmax())
+    label = id2label[best]           # POSITIVE / NEGATIVE
+    score = float(prob_row[best])    # confidence (0–1)
 
     # 🔥 REAL signed neural output
     signed_score = score if label == "POSITIVE" else -score
@@ -19,4 +78,96 @@ def distilbert_sentiment(text):
         "label": label,
         "score": score,
         "signed_score": signed_score
-    }
\ No newline at end of file
+    }
+
+
+def _split_windows(ids, overlap=WINDOW_OVERLAP):
+    # ids carry no special tokens; each window leaves room for them.
+    tokenizer = get_model("distilbert_sentiment").tokenizer
+    body = MAX_TOKENS - tokenizer.num_special_tokens_to_add()
+    step = max(body - overlap, 1)
+
+    windows = []
+    for start in range(0, max(len(ids), 1), step):
+        windows.append(tokenizer.build_inputs_with_special_tokens(ids[start:start + body]))
+        if start + body >= len(ids):
+            break
+    return windows
+
+
+def _reduce_windows(probs, owners, lengths, n_docs, reducer):
+    """
+    Collapses window-level probabilities to one row per document.
+      mean     – plain average over windows
+      weighted – average weighted by each window's token count
+      max      – the window with the most confident prediction
+    """
+    if reducer not in REDUCERS:
+        raise ValueError(f"Unknown reducer '{reducer}'. Choose from {REDUCERS}.")
+
+    if reducer == "max":
+        confidence = probs.max(axis=1)
+        best = np.full(n_docs, -1)
+        for w in np.argsort(confidence, kind="stable"):
+            best[owners[w]] = w
+        return probs[best]
+
+    weights = lengths.astype(np.float32) if reducer == "weighted" else np.ones(len(owners), dtype=np.float32)
+    totals = np.bincount(owners, weights=weights, minlength=n_docs)
+    reduced = np.stack([
+        np.bincount(owners, weights=probs[:, c] * weights, minlength=n_docs)
+        for c in range(probs.shape[1])
+    ], axis=1)
+    return (reduced / totals[:, None]).astype(np.float32)
+
+
+def distilbert_sentiment_batch(texts, batch_size=BATCH_SIZE, strategy="truncate",
+                               reducer="mean", overlap=WINDOW_OVERLAP, contexts=None):
+    """
+    Scores many texts at once and returns one result dict per text, in
+    input order. Each text is tokenized once; with `contexts` (one
+    DocumentContext per text) their cached token ids are reused.
+      strategy="truncate" – keep the first MAX_TOKENS model tokens
+      strategy="window"   – split into overlapping MAX_TOKENS windows, run
+                            every window of every text in one batched pass
+                            and combine them per text with `reducer`
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    if strategy not in ("truncate", "window"):
+        raise ValueError(f"Unknown strategy '{strategy}'. Use 'truncate' or 'window'.")
+
+    tokenizer = get_model("distilbert_sentiment").tokenizer
+    body = MAX_TOKENS - tokenizer.num_special_tokens_to_add()
+    if contexts is not None:
+        token_ids = [context.token_ids(tokenizer) for context in contexts]
+    elif strategy == "truncate":
+        # Only the prefix is used, so don't tokenize past it
+        token_ids = tokenizer(texts, add_special_tokens=False, truncation=True, max_length=body)["input_ids"]
+    else:
+        token_ids = tokenizer(texts, add_special_tokens=False)["input_ids"]
+
+    if strategy == "truncate":
+        inputs = [tokenizer.build_inputs_with_special_tokens(ids[:body]) for ids in token_ids]
+        probs = _predict_token_ids(inputs, batch_size=batch_size)
+        return [_to_result(row) for row in probs]
+
+    windows, owners = [], []
+    for doc_idx, ids in enumerate(token_ids):
+        doc_windows = _split_windows(ids, overlap)
+        windows.extend(doc_windows)
+        owners.extend([doc_idx] * len(doc_windows))
+
+    owners = np.asarray(owners)
+    lengths = np.array([len(w) for w in windows])
+    window_probs = _predict_token_ids(windows, batch_size=batch_size)
+    probs = _reduce_windows(window_probs, owners, lengths, len(texts), reducer)
+    return [_to_result(row) for row in probs]
+
+
+def distilbert_sentiment(text, strategy="truncate", reducer="mean", context=None):
+    contexts = [context] if context is not None else None
+    return distilbert_sentiment_batch([text], strategy=strategy, reducer=reducer,
+                                      contexts=contexts)[0]
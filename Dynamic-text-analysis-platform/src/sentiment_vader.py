@@ -1,10 +1,7 @@
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-
-# Initialize once
-sia = SentimentIntensityAnalyzer()
+from src.model_loader import get_model
 
 def vader_sentiment(text):
-    scores = sia.polarity_scores(text)
+    scores = get_model("vader").polarity_scores(text)
 
     pos = scores["pos"]
     neu = scores["neu"]
@@ -54,56 +54,109 @@ def summarize_text(text, num_sentences=3):
 
 
 import nltk
-import re
 import numpy as np
-import networkx as nx
 
 from nltk.tokenize import sent_tokenize
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
+from src.summary_cache import get_summary_cache, summary_key
+from src.text_cleaning import clean_sentence
 
-def clean_sentence(sentence):
-    sentence = re.sub(r"http\S+", "", sentence)
-    sentence = re.sub(r"\S+@\S+", "", sentence)
-    sentence = re.sub(r"#\w+", "", sentence)
-    sentence = re.sub(r"[^\w\s.,]", "", sentence)
-    return sentence.strip()
+# Similarities below this are dropped so long reports keep a sparse graph
+SIMILARITY_THRESHOLD = 0.01
 
+# Same defaults as nx.pagerank
+PAGERANK_ALPHA = 0.85
+PAGERANK_MAX_ITER = 100
+PAGERANK_TOL = 1.0e-6
 
-def summarize_text(text, num_sentences=3):
-    # 1️⃣ Sentence tokenize (RAW text)
-    sentences = sent_tokenize(text)
-
-    if len(sentences) <= num_sentences:
-        return sentences
 
-    # Clean sentences (light cleaning only)
-    clean_sentences = [clean_sentence(s) for s in sentences]
-
-    # 2️⃣ TF-IDF sentence embeddings
+def similarity_graph(sentences, threshold=SIMILARITY_THRESHOLD):
+    """
+    Sparse sentence x sentence cosine similarity of TF-IDF vectors.
+    The rows are already L2-normalised, so this is one sparse product.
+    """
     vectorizer = TfidfVectorizer(stop_words="english")
-    sentence_vectors = vectorizer.fit_transform(clean_sentences)
-
-    # 3️⃣ Sentence similarity matrix
-    similarity_matrix = cosine_similarity(sentence_vectors)
-
-    # 4️⃣ Build similarity graph
-    sentence_graph = nx.from_numpy_array(similarity_matrix)
+    sentence_vectors = vectorizer.fit_transform(sentences)
+
+    similarity = (sentence_vectors @ sentence_vectors.T).tocsr()
+    if threshold > 0:
+        similarity.data[similarity.data < threshold] = 0
+        similarity.eliminate_zeros()
+    return similarity
+
+
+def pagerank(graph, alpha=PAGERANK_ALPHA, max_iter=PAGERANK_MAX_ITER, tol=PAGERANK_TOL):
+    """
+    Weighted PageRank by power iteration on a sparse adjacency matrix,
+    matching nx.pagerank: uniform start and teleport, dangling nodes
+    spread their rank uniformly, self-loops count as edges.
+    """
+    n = graph.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    out_weight = np.asarray(graph.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transition_t = graph.T.tocsr().multiply(inv_out[None, :]).tocsr()   # column-stochastic
+
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha * (transition_t @ x_last + x_last[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(x - x_last).sum() < n * tol:
+            break
+    return x
+
+
+def textrank_scores(sentences, threshold=SIMILARITY_THRESHOLD):
+    """
+    TextRank score per sentence (input order) after light cleaning.
+    """
+    clean_sentences = [clean_sentence(s) for s in sentences]
+    return pagerank(similarity_graph(clean_sentences, threshold))
+
+
+def select_sentences(scores, lengths, budget):
+    """
+    Indices of the highest-scoring sentences whose lengths fit within
+    `budget`, in original document order. Sentences that don't fit are
+    skipped so shorter, lower-ranked ones can still fill the budget.
+    """
+    selected, used = [], 0
+    for i in np.argsort(-np.asarray(scores), kind="stable"):
+        if used + lengths[i] <= budget:
+            selected.append(i)
+            used += lengths[i]
+    return np.sort(np.asarray(selected, dtype=int))
+
+
+def summarize_text(text, num_sentences=3, context=None, use_cache=True):
+    # 0️⃣ Same text and settings as an earlier call → stored summary
+    # (raw text in the key: the summary is sentences cut from it)
+    cache = get_summary_cache() if use_cache else None
+    if cache is not None:
+        key = summary_key(text, "textrank", normalize=False, num_sentences=num_sentences,
+                          threshold=SIMILARITY_THRESHOLD)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    # 1️⃣ Sentence tokenize (RAW text), reusing the context's split if given
+    sentences = context.sentences if context is not None else sent_tokenize(text)
 
-    # 5️⃣ PageRank scoring
-    scores = nx.pagerank(sentence_graph)
+    if len(sentences) <= num_sentences:
+        return sentences
 
-    # 6️⃣ Rank sentences by PageRank score
-    ranked_sentences = sorted(
-        ((scores[i], s) for i, s in enumerate(sentences)),
-        reverse=True
-    )
+    # 2️⃣-5️⃣ TF-IDF similarity graph + PageRank scoring
+    scores = textrank_scores(sentences)
 
-    # 7️⃣ Pick top N sentences
-    selected_sentences = [s for _, s in ranked_sentences[:num_sentences]]
+    # 6️⃣-7️⃣ Pick top N sentence indices without a full sort
+    top = np.argpartition(-scores, num_sentences - 1)[:num_sentences]
 
     # 8️⃣ Preserve original document order
-    ordered_summary = [s for s in sentences if s in selected_sentences]
-
-    return ordered_summary
\ No newline at end of file
+    summary = [sentences[i] for i in np.sort(top)]
+    if cache is not None:
+        cache.put(key, summary)
+    return summary
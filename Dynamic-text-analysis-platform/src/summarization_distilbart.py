@@ -1,18 +1,214 @@
-from src.model_loader import get_distilbart
+import os
 
-def distilbart_summarize(text, max_length=220, min_length=80):
-    text = " ".join(text.split()[:900])
+import numpy as np
 
-    if len(text.split()) < 50:
-        return ["Text too short to summarize"]
+from src.analysis_context import DocumentContext
+from src.model_loader import DISTILBART_MODEL, get_distilbart
+from src.summarization import select_sentences, textrank_scores
+from src.summary_cache import get_summary_cache, summary_key
+
+# Same setting as src.inference_backend, read here without importing torch
+# so cache hits never load the model stack
+BACKEND = os.environ.get("TEXT_ANALYSIS_BACKEND", "pytorch").lower()
+
+MODES = ("truncate", "chunked", "hybrid")
+# Inputs per generate call; similar lengths are batched together
+BATCH_SIZE = 4
+# Chunked mode: at most MAX_CHUNKS encoder-sized chunks are summarized,
+# spread evenly over the document
+MAX_CHUNKS = 8
+CHUNK_SUMMARY_MAX_LENGTH = 120
+CHUNK_SUMMARY_MIN_LENGTH = 30
+
+
+def _encoder_body(tokenizer):
+    # Room left in the encoder once special tokens are added
+    return tokenizer.model_max_length - tokenizer.num_special_tokens_to_add()
+
+
+def chunk_token_ids(sentence_ids, body):
+    """
+    Greedily packs consecutive sentences into chunks of at most `body`
+    tokens. A sentence longer than `body` is split on its own.
+    """
+    chunks, current = [], []
+    for ids in sentence_ids:
+        if len(current) + len(ids) > body and current:
+            chunks.append(current)
+            current = []
+        while len(ids) > body:
+            chunks.append(ids[:body])
+            ids = ids[body:]
+        current = current + ids
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _generate(summarizer, id_lists, max_length, min_length, batch_size=BATCH_SIZE,
+              clamp_min_length=False):
+    """
+    Summarizes several token-id inputs (without special tokens), batching
+    inputs of similar length together. Summaries come back in input order.
+    clamp_min_length caps min_length at half the shortest input of each
+    batch, so short inputs (e.g. a tail chunk) aren't padded out.
+    """
+    import torch
+
+    tokenizer = summarizer.tokenizer
+    inputs = [tokenizer.build_inputs_with_special_tokens(ids) for ids in id_lists]
+    order = np.argsort([len(ids) for ids in inputs], kind="stable")
+    summaries = [None] * len(inputs)
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            batch = tokenizer.pad({"input_ids": [inputs[i] for i in idx]}, return_tensors="pt")
+            batch_min_length = min_length
+            if clamp_min_length:
+                batch_min_length = min(min_length, min(len(id_lists[i]) for i in idx) // 2)
+            output = summarizer.model.generate(
+                **batch,
+                max_length=max_length,
+                min_length=batch_min_length,
+                do_sample=False
+            )
+            for i, text in zip(idx, tokenizer.batch_decode(output, skip_special_tokens=True)):
+                summaries[i] = text
+
+    return summaries
+
+
+def _select_chunks(chunks, max_chunks):
+    # Latency budget: keep max_chunks chunks spread over the whole document
+    # rather than only its beginning
+    if len(chunks) <= max_chunks:
+        return chunks
+    keep = np.unique(np.linspace(0, len(chunks) - 1, max_chunks).round().astype(int))
+    return [chunks[i] for i in keep]
+
+
+def hybrid_token_ids(context, tokenizer, budget):
+    """
+    Extractive pre-selection: the TextRank-best sentences that fit in
+    `budget` tokens, concatenated in document order.
+    """
+    sentence_ids = context.sentence_token_ids(tokenizer)
+    try:
+        scores = textrank_scores(context.sentences)
+    except ValueError:
+        # No sentence has a non-stopword term: keep the original order
+        scores = -np.arange(len(sentence_ids), dtype=float)
+    selected = select_sentences(scores, [len(ids) for ids in sentence_ids], budget)
+    return [token for i in selected for token in sentence_ids[i]]
+
+
+def distilbart_summarize_batch(texts, max_length=220, min_length=80, contexts=None,
+                               mode="truncate", max_chunks=MAX_CHUNKS, batch_size=BATCH_SIZE,
+                               use_cache=True, token_budget=None):
+    """
+    Summarizes many documents with padded, length-sorted batches and beam
+    search over each batch; one result list per text, in input order.
+    In chunked mode the chunks of every document share the same batched
+    map pass, and the documents that needed it share the reduce pass.
+    In hybrid mode documents longer than token_budget (default: the
+    encoder size) are condensed to their top TextRank sentences first.
+    With use_cache, summaries already in the persistent summary cache are
+    returned without running (or loading) the model.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose from {MODES}.")
+
+    texts = list(texts)
+    contexts = list(contexts) if contexts is not None else [DocumentContext(t) for t in texts]
+    results = [["Text too short to summarize"] for _ in texts]
+    todo = [i for i, context in enumerate(contexts) if len(context.words) >= 50]
+
+    keys = {}
+    cache = get_summary_cache() if use_cache else None
+    if cache is not None:
+        pending = []
+        for i in todo:
+            keys[i] = summary_key(
+                contexts[i].normalized_text, DISTILBART_MODEL, backend=BACKEND, mode=mode,
+                max_length=max_length, min_length=min_length, max_chunks=max_chunks,
+                token_budget=token_budget
+            )
+            cached = cache.get(keys[i])
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        todo = pending
+
+    if not todo:
+        return results
 
     summarizer = get_distilbart()
+    tokenizer = summarizer.tokenizer
+    body = _encoder_body(tokenizer)
+    budget = min(token_budget or body, body)
+
+    # doc index -> token ids of the single input that gets the final pass
+    inputs = {}
+    chunked = {}
+    for i in todo:
+        ids = contexts[i].token_ids(tokenizer)
+        if mode == "chunked" and len(ids) > body:
+            chunks = chunk_token_ids(contexts[i].sentence_token_ids(tokenizer), body)
+            chunks = _select_chunks(chunks, max_chunks)
+            if len(chunks) > 1:
+                chunked[i] = chunks
+                continue
+        if mode == "hybrid" and len(ids) > budget:
+            inputs[i] = hybrid_token_ids(contexts[i], tokenizer, budget) or ids[:budget]
+            continue
+        # Longer input than the encoder takes is cut at the token limit
+        inputs[i] = ids[:body]
 
-    summary = summarizer(
-        text,
-        max_length=max_length,
-        min_length=min_length,
-        do_sample=False
+    if chunked:
+        owners = [i for i, chunks in chunked.items() for _ in chunks]
+        partials = _generate(
+            summarizer, [chunk for chunks in chunked.values() for chunk in chunks],
+            max_length=CHUNK_SUMMARY_MAX_LENGTH,
+            min_length=CHUNK_SUMMARY_MIN_LENGTH,
+            batch_size=batch_size,
+            clamp_min_length=True
+        )
+        joined = {}
+        for i, partial in zip(owners, partials):
+            joined.setdefault(i, []).append(partial)
+        for i, doc_partials in joined.items():
+            ids = tokenizer(" ".join(doc_partials), add_special_tokens=False)["input_ids"]
+            inputs[i] = ids[:body]
+
+    order = list(inputs)
+    summaries = _generate(
+        summarizer, [inputs[i] for i in order],
+        max_length=max_length, min_length=min_length, batch_size=batch_size
     )
+    for i, summary in zip(order, summaries):
+        results[i] = [summary]
+        if cache is not None:
+            cache.put(keys[i], results[i])
+    return results
+
 
-    return [summary[0]["summary_text"]]
+def distilbart_summarize(text, max_length=220, min_length=80, context=None,
+                         mode="truncate", max_chunks=MAX_CHUNKS, use_cache=True, token_budget=None):
+    """
+    Abstractive summary of the text. Token ids come from the document
+    context, so the text is tokenized once per request.
+      mode="truncate" – summarize the first encoder-sized block of tokens
+      mode="chunked"  – map-reduce: split on sentence boundaries into
+                        encoder-sized chunks, summarize up to max_chunks of
+                        them in batched generate calls, then summarize the
+                        joined chunk summaries
+      mode="hybrid"   – summarize only the top TextRank sentences that fit
+                        in token_budget tokens, in document order
+    """
+    context = context or DocumentContext(text)
+    return distilbart_summarize_batch(
+        [text], max_length, min_length, contexts=[context],
+        mode=mode, max_chunks=max_chunks, use_cache=use_cache, token_budget=token_budget
+    )[0]
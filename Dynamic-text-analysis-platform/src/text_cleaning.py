@@ -0,0 +1,44 @@
+# src/text_cleaning.py
+import re
+
+# Patterns are compiled once at import and shared by every cleaner.
+URL_PATTERN = re.compile(r"http\S+|www\S+", re.IGNORECASE)
+NON_ALPHA_PATTERN = re.compile(r"[^a-z\s]")
+LINK_PATTERN = re.compile(r"http\S+")
+EMAIL_PATTERN = re.compile(r"\S+@\S+")
+HASHTAG_PATTERN = re.compile(r"#\w+")
+SENTENCE_NOISE_PATTERN = re.compile(r"[^\w\s.,]")
+
+
+def _alpha_lower_byte(b):
+    c = chr(b).lower()
+    return c if ("a" <= c <= "z" or c.isspace()) else " "
+
+
+# bytes.translate table for ASCII text: lowercase letters, keep whitespace,
+# everything else becomes a space -- one C-level pass over the buffer.
+ALPHA_LOWER_BYTES = "".join(_alpha_lower_byte(b) for b in range(128)).encode("ascii") + b" " * 128
+
+
+def normalize_for_topics(text):
+    """
+    Lowercase, drop URLs and replace anything that is not a letter with a
+    space. Same output as the lower / URL / non-alpha steps of
+    preprocess_text.
+    """
+    text = URL_PATTERN.sub("", text)
+    if text.isascii():
+        return text.encode("ascii").translate(ALPHA_LOWER_BYTES).decode("ascii")
+    return NON_ALPHA_PATTERN.sub(" ", text.lower())
+
+
+def clean_sentence(sentence):
+    sentence = LINK_PATTERN.sub("", sentence)
+    sentence = EMAIL_PATTERN.sub("", sentence)
+    sentence = HASHTAG_PATTERN.sub("", sentence)
+    sentence = SENTENCE_NOISE_PATTERN.sub("", sentence)
+    return sentence.strip()
+
+
+def clean_batch(texts, cleaner=normalize_for_topics):
+    return [cleaner(t) for t in texts]
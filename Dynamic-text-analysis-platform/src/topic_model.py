@@ -1,5 +1,12 @@
+import hashlib
+import os
+import shutil
+import joblib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
-
+import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 
@@ -25,16 +32,164 @@ def apply_lda(dtm, n_topics=5):
     return lda
 
 
-def display_topics(lda_model, vectorizer, n_words=10):
-    feature_names = vectorizer.get_feature_names_out()
+# ---------------- Parallel topic-count sweep ----------------
+
+def _share_dtm(dtm, folder):
+    # Write the CSR buffers once; workers memory-map them read-only
+    # instead of receiving a pickled copy each.
+    dtm = sparse.csr_matrix(dtm)
+    if not np.issubdtype(dtm.dtype, np.floating):
+        dtm = dtm.astype(np.float64)
+    for name in ("data", "indices", "indptr"):
+        np.save(os.path.join(folder, f"{name}.npy"), getattr(dtm, name))
+    return dtm.shape
+
+
+def _load_shared_dtm(folder, shape):
+    data, indices, indptr = (
+        np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r")
+        for name in ("data", "indices", "indptr")
+    )
+    return sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def _fit_shared(folder, shape, k):
+    dtm = _load_shared_dtm(folder, shape)
+    lda = apply_lda(dtm, n_topics=k)
+    return k, lda, lda.perplexity(dtm)
+
+
+def sweep_lda(dtm, topic_values, score_fn, n_jobs=None, patience=2, min_delta=1e-3):
+    """
+    Trains one LDA per candidate topic count across a process pool and
+    scores each with score_fn(lda_model) -> coherence.
+
+    Candidates run in waves of n_jobs in ascending k. After each wave the
+    sweep stops once coherence has not improved by more than min_delta
+    for `patience` consecutive k values. n_jobs defaults to patience + 1
+    (capped at the CPU count): waves that large can still end the sweep
+    early, while a wave of every candidate would always train them all. Fitted models are kept, so the
+    winner can be used directly instead of being retrained.
+
+    returns: {"models": {k: lda}, "perplexity": {k: float},
+              "coherence": {k: float}, "best_k": int}
+    """
+    topic_values = sorted(topic_values)
+    if n_jobs is None:
+        n_jobs = min(os.cpu_count() or 1, patience + 1)
+    n_jobs = max(1, min(n_jobs, len(topic_values)))
+
+    models, perplexity, coherence = {}, {}, {}
+    best_k, best_score, stale = None, -np.inf, 0
+
+    folder = tempfile.mkdtemp(prefix="lda_dtm_")
+    try:
+        shape = _share_dtm(dtm, folder)
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            for start in range(0, len(topic_values), n_jobs):
+                wave = topic_values[start:start + n_jobs]
+                futures = [pool.submit(_fit_shared, folder, shape, k) for k in wave]
+
+                for future in futures:
+                    k, lda, perp = future.result()
+                    models[k] = lda
+                    perplexity[k] = perp
+                    coherence[k] = score_fn(lda)
+
+                    if coherence[k] > best_score + min_delta:
+                        best_k, best_score, stale = k, coherence[k], 0
+                    else:
+                        stale += 1
+
+                if stale >= patience:
+                    break
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        "models": models,
+        "perplexity": perplexity,
+        "coherence": coherence,
+        "best_k": best_k
+    }
+
+
+# ---------------- Topic summaries ----------------
+
+TOPIC_SUMMARY_PATH = "models/topic_summary.pkl"
+
+_summary_cache = {}
+
+
+def top_word_indices(components, n_words=10):
+    """
+    Returns an (n_topics, n_words) matrix of word indices, highest weight
+    first, using one argpartition over the whole topic-word matrix and a
+    sort of only the selected columns.
+    """
+    components = np.asarray(components)
+    n_words = min(n_words, components.shape[1])
+    top = np.argpartition(-components, n_words - 1, axis=1)[:, :n_words]
+    order = np.argsort(-np.take_along_axis(components, top, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1)
+
+
+def model_fingerprint(lda_model, feature_names):
+    """
+    Content hash of the topic-word matrix and vocabulary: identifies a
+    fitted model regardless of object identity or topic count.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(lda_model.components_).tobytes())
+    digest.update("\0".join(map(str, feature_names)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_topic_summary(lda_model, feature_names, n_words=10, fingerprint=None):
+    feature_names = np.asarray(feature_names)
+    top = top_word_indices(lda_model.components_, n_words)
+    return {
+        "fingerprint": fingerprint or model_fingerprint(lda_model, feature_names),
+        "n_words": top.shape[1],
+        "words": feature_names[top],
+        "weights": np.take_along_axis(lda_model.components_, top, axis=1)
+    }
+
+
+def get_topic_summary(lda_model, feature_names, n_words=10, cache_path=None):
+    """
+    Top words per topic, computed once per model. The summary is kept in
+    memory and, when cache_path is given, stored next to the pickled
+    model and reloaded from there on later runs. Both are keyed by the
+    model's content fingerprint, so a retrained model never gets stale
+    words.
+    """
+    key = model_fingerprint(lda_model, feature_names)
+    summary = _summary_cache.get(key)
+
+    if summary is None and cache_path and os.path.exists(cache_path):
+        summary = joblib.load(cache_path)
+        if summary.get("fingerprint") != key:
+            summary = None   # stale file from a different model
+
+    if summary is None or summary["n_words"] < n_words:
+        summary = build_topic_summary(lda_model, feature_names, n_words, fingerprint=key)
+        if cache_path:
+            joblib.dump(summary, cache_path)
+
+    _summary_cache[key] = summary
+    return summary
+
+
+def display_topics(lda_model, vectorizer, n_words=10, cache_path=None):
+    summary = get_topic_summary(
+        lda_model, vectorizer.get_feature_names_out(), n_words, cache_path
+    )
 
     topic_name_map = {}
 
-    for topic_idx, topic in enumerate(lda_model.components_):
-        top_words = [
-            feature_names[i]
-            for i in topic.argsort()[:-n_words-1:-1]
-        ]
+    for topic_idx, words in enumerate(summary["words"]):
+        top_words = [str(w) for w in words[:n_words]]
 
         # 🔹 AUTO TOPIC NAME (your idea)
         topic_name = "_".join(top_words[:2])   # first 2 words
@@ -0,0 +1,36 @@
+import os
+import joblib
+
+from src.input_handler import iter_batches, iter_documents
+from src.online_lda import OnlineTopicModel
+from src.preprocessing import PreprocessPool, save_token_cache, TOKEN_CACHE_PATH
+
+CHECKPOINT_PATH = "models/online_lda.pkl"
+VOCABULARY_PATH = "models/vectorizer.pkl"
+
+
+if __name__ == "__main__":
+    if os.path.exists(CHECKPOINT_PATH):
+        # Resume: new documents only update the existing topics
+        model = OnlineTopicModel.load(CHECKPOINT_PATH)
+        print(f"🔄 Resuming from checkpoint ({model.n_docs_seen} documents seen)")
+    elif os.path.exists(VOCABULARY_PATH):
+        model = OnlineTopicModel.from_vectorizer(joblib.load(VOCABULARY_PATH))
+    else:
+        model = OnlineTopicModel()
+
+    # Files already in the checkpoint are never even read (a large file
+    # counts once its first part has been trained on)
+    new_documents = iter_documents("data/raw", skip_ids=model.seen_doc_ids)
+
+    # One process pool for the whole stream instead of one per batch
+    with PreprocessPool(cache_path=TOKEN_CACHE_PATH) as preprocess:
+        model.fit_stream(
+            iter_batches(new_documents, batch_size=256),
+            preprocess=preprocess,
+            checkpoint_path=CHECKPOINT_PATH,
+            checkpoint_every=10
+        )
+    save_token_cache(TOKEN_CACHE_PATH)
+
+    print(f"✅ Online LDA updated with {model.n_docs_seen} documents total")
@@ -1,6 +1,7 @@
+import hashlib
 import os
-import re
 import pickle
+import numpy as np
 import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
@@ -18,6 +19,7 @@ import plotly.graph_objects as go
 
 from validation import read_file, basic_checks
 from summarizer import summarize_text
+from text_cleaning import clean_batch, normalize_sentiment_text
 from reporting import build_docx_report, generate_insights_and_recommendations
 
 st.set_page_config(
@@ -160,6 +162,8 @@ NEUTRAL_HIGH = 0.60
 SUMMARY_MIN_LEN = 40
 SUMMARY_MAX_LEN = 90
 SUMMARY_BEAMS = 4
+SPACY_BATCH_SIZE = 256
+SPACY_N_PROCESS = 1
 
 # ----- PATHS -----
 BASE_DIR = "saved_models"
@@ -168,11 +172,14 @@ DICT_PATH = os.path.join(BASE_DIR, "ldaDictionary.gensim")
 PHRASERS_PATH = os.path.join(BASE_DIR, "Phrasers.pkl")
 SENTIMENT_MODEL_PATH = os.path.join(BASE_DIR, "sentiment_model.pkl")
 VECTORIZER_PATH = os.path.join(BASE_DIR, "tfidf_vectorizer.pkl")
+TOPIC_SUMMARY_PATH = os.path.join(BASE_DIR, "topic_summary.pkl")
+TOPIC_SUMMARY_TOPN = 15
 
 # ----- LOAD RESOURCES -----
 @st.cache_resource
 def load_nlp():
-    return spacy.load("en_core_web_sm")
+    # Only the tagger and lemmatizer are used; skip the parser and NER.
+    return spacy.load("en_core_web_sm", disable=["parser", "ner"])
 
 @st.cache_resource
 def load_artifacts():
@@ -202,7 +209,7 @@ def load_artifacts():
     return lda, id2word, bigram_mod, trigram_mod, sentiment_model, vectorizer
 
 nlp = load_nlp()
-stop_words = stopwords.words("english")
+stop_words = set(stopwords.words("english"))
 preserve_words = {
     "no","not","never","none","nobody","nothing","neither","nor",
     "very","too","so","such","just","only","really","even",
@@ -216,10 +223,7 @@ if 'analyzed' not in st.session_state:
 if 'results' not in st.session_state:
     st.session_state.results = {}
 
-def clean_text_sentiment(text):
-    text = str(text).lower()
-    text = re.sub(r'[^a-z\s]', ' ', text)
-    doc = nlp(text)
+def sentiment_lemmas(doc):
     tokens = []
     for token in doc:
         if token.text in stop_words and token.text not in preserve_words:
@@ -227,13 +231,6 @@ def clean_text_sentiment(text):
         tokens.append(token.lemma_)
     return " ".join(tokens)
 
-def clean_text(text):
-    # Keep only letters, collapse whitespace, lowercase
-    text = re.sub(r"<.*?>", " ", str(text))
-    text = re.sub(r"[^a-zA-Z]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip().lower()
-    return text
-
 def tokenize(text, min_len=3):
     return [
         tok for tok in simple_preprocess(text, deacc=True)
@@ -246,25 +243,42 @@ def build_phrases(tokens_list, bigram_model, trigram_model):
     trigrammed = [trigram_model[doc] for doc in bigrammed]
     return trigrammed
 
-def lemmatization(token_docs, allowed_postags=("NOUN","ADJ","VERB","ADV")):
-    texts_out = []
-    for doc_tokens in token_docs:
-        doc = nlp(" ".join(doc_tokens))
-        texts_out.append([token.lemma_ for token in doc if token.pos_ in allowed_postags])
-    return texts_out
+def pos_lemmas(doc, allowed_postags=("NOUN","ADJ","VERB","ADV")):
+    return [token.lemma_ for token in doc if token.pos_ in allowed_postags]
 
-def infer_topics(texts):
-    """
-    texts: list of raw strings
-    returns: list of (bow, topic_dist) per doc
-    """
-    cleaned = [clean_text(t) for t in texts]
+def phrase_tokens(texts):
+    cleaned = clean_batch(texts)
     tokenized = [tokenize(t) for t in cleaned]
-    phrased = build_phrases(tokenized, bigram_model, trigram_model)
-    lemmatized = lemmatization(phrased)
+    return build_phrases(tokenized, bigram_model, trigram_model)
+
+def topic_distributions(lemmatized):
     bows = [dictionary.doc2bow(doc) for doc in lemmatized]
     topic_dists = [lda_model.get_document_topics(bow, minimum_probability=0.0) for bow in bows]
-    return bows, topic_dists, lemmatized
+    return bows, topic_dists
+
+def analyze_texts(texts, batch_size=SPACY_BATCH_SIZE, n_process=SPACY_N_PROCESS):
+    """
+    Runs the topic and sentiment preprocessing for a batch of raw texts
+    through a single nlp.pipe stream: the phrased LDA inputs and the
+    sentiment inputs share one batched stream (each text is still parsed
+    twice, once per input form) instead of a per-text nlp() call.
+    returns: (bows, topic_dists, lemmatized, sentiment_texts)
+    """
+    texts = list(texts)
+    n = len(texts)
+    lda_inputs = [" ".join(doc_tokens) for doc_tokens in phrase_tokens(texts)]
+    sentiment_inputs = clean_batch(texts, cleaner=normalize_sentiment_text)
+
+    lemmatized, sentiment_texts = [], []
+    docs = nlp.pipe(lda_inputs + sentiment_inputs, batch_size=batch_size, n_process=n_process)
+    for i, doc in enumerate(docs):
+        if i < n:
+            lemmatized.append(pos_lemmas(doc))
+        else:
+            sentiment_texts.append(sentiment_lemmas(doc))
+
+    bows, topic_dists = topic_distributions(lemmatized)
+    return bows, topic_dists, lemmatized, sentiment_texts
 
 def get_dominant_topic(topic_dist):
     """
@@ -275,9 +289,55 @@ def get_dominant_topic(topic_dist):
         return None, 0.0
     return max(topic_dist, key = lambda x: x[1])
 
+def topic_fingerprint(lda, topics=None):
+    # Content hash of the topic-word matrix: a retrained model with the
+    # same number of topics still gets a new fingerprint
+    topics = lda.get_topics() if topics is None else topics
+    return hashlib.blake2b(np.ascontiguousarray(topics).tobytes(), digest_size=16).hexdigest()
+
+def build_topic_summary(lda, topn=TOPIC_SUMMARY_TOPN):
+    # One argpartition over the full topic-word matrix instead of a
+    # show_topic() sort per topic
+    topics = lda.get_topics()
+    topn = min(topn, topics.shape[1])
+    top = np.argpartition(-topics, topn - 1, axis=1)[:, :topn]
+    order = np.argsort(-np.take_along_axis(topics, top, axis=1), axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    return {
+        "fingerprint": topic_fingerprint(lda, topics),
+        "num_topics": lda.num_topics,
+        "topn": topn,
+        "words": [[lda.id2word[int(i)] for i in row] for row in top],
+        "weights": np.take_along_axis(topics, top, axis=1)
+    }
+
+@st.cache_resource
+def load_topic_summary(_lda, topn=TOPIC_SUMMARY_TOPN):
+    """
+    Top words per topic, computed once per model and stored next to it
+    in saved_models/. Later calls are a dictionary lookup.
+    """
+    summary = None
+    if os.path.exists(TOPIC_SUMMARY_PATH):
+        with open(TOPIC_SUMMARY_PATH, "rb") as f:
+            summary = pickle.load(f)
+        if summary.get("fingerprint") != topic_fingerprint(_lda) or summary.get("topn", 0) < topn:
+            summary = None   # different model, or too few words stored
+
+    if summary is None:
+        summary = build_topic_summary(_lda, topn)
+        try:
+            with open(TOPIC_SUMMARY_PATH, "wb") as f:
+                pickle.dump(summary, f)
+        except OSError:
+            pass  # read-only deployment: keep the in-memory copy
+
+    summary["words_map"] = {tid: words[:10] for tid, words in enumerate(summary["words"])}
+    return summary
+
 def topic_keywords(lda, topic_id, topn=10):
-    raw_output = lda.show_topic(topic_id, topn=topn)
-    return raw_output
+    summary = load_topic_summary(lda)
+    return list(zip(summary["words"][topic_id][:topn], summary["weights"][topic_id][:topn]))
 
 # ----- VISUALISATIONS -----
 def plot_sentiment_bars(prob_neg, prob_pos):
@@ -384,7 +444,7 @@ if analyze_btn:
         else:
             try:
                 # Topic Modeling
-                bows, topic_dists, lemmatized = infer_topics([raw_text])
+                bows, topic_dists, lemmatized, sentiment_texts = analyze_texts([raw_text])
                 dom_tid, dom_prob = get_dominant_topic(topic_dists[0])
 
                 top_keywords_weighted = topic_keywords(lda_model, dom_tid, topn=15)
@@ -396,20 +456,19 @@ if analyze_btn:
                         top_words_list.append(str(item))
 
                 # Sentiment
-                cleaned_sent = clean_text_sentiment(raw_text)
-                vec = vectorizer.transform([cleaned_sent])
+                vec = vectorizer.transform(sentiment_texts)
                 probs = sentiment_model.predict_proba(vec)[0] # [prob_0, prob_1]
                 prob_neg, prob_pos = probs[0], probs[1]
 
                 # Summarization
                 try:
-                    summary = summarize_text(raw_text, min_length=SUMMARY_MIN_LEN, max_length=SUMMARY_MAX_LEN, num_beams=SUMMARY_BEAMS)
+                    summary = summarize_text(raw_text, min_length=SUMMARY_MIN_LEN, max_length=SUMMARY_MAX_LEN, num_beams=SUMMARY_BEAMS, mode="chunked")
                 except:
                     summary = "Summarizer unavailable."
 
                 # Insights
                 # Build map for reporting
-                topic_words_map = {tid: [w for w, p in topic_keywords(lda_model, tid, topn=10)] for tid in range(lda_model.num_topics)}
+                topic_words_map = load_topic_summary(lda_model)["words_map"]
                 insights, recs = generate_insights_and_recommendations(topic_words_map, prob_pos)
 
                 # Store in Session State
@@ -0,0 +1,79 @@
+"""
+Microbenchmark: precompiled / str.translate cleaners in text_cleaning
+against the per-call regex versions they replaced, on a synthetic corpus.
+
+    python benchmark_cleaning.py [n_docs]
+"""
+import random
+import re
+import sys
+import time
+
+from text_cleaning import clean_batch, clean_text, normalize_sentiment_text, sanitize_text
+
+
+def legacy_clean_text(text):
+    text = re.sub(r"<.*?>", " ", str(text))
+    text = re.sub(r"[^a-zA-Z]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip().lower()
+    return text
+
+
+def legacy_sentiment_text(text):
+    text = str(text).lower()
+    return re.sub(r'[^a-z\s]', ' ', text)
+
+
+def legacy_sanitize_text(text):
+    if not isinstance(text, str):
+        text = str(text) if text is not None else ""
+    text = re.sub(r"<[^>]+>", " ", text)
+    return " ".join(text.strip().split())
+
+
+WORDS = [
+    "The", "pizza", "was", "GREAT", "but", "service", "slow", "<br/>", "<b>",
+    "10/10", "didn't", "!!!", "price", "$12.99", "staff", "friendly",
+    "\t", "cold", "fries", "won't", "return"
+]
+NON_ASCII_WORDS = ["café", "😋", "crème", "—", "€40", "jalapeño"]
+
+
+def synthetic_corpus(n_docs, words_per_doc=60, non_ascii_share=0.1, seed=42):
+    # Mostly plain-ASCII reviews, with a share containing accents/emoji.
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n_docs):
+        words = [rng.choice(WORDS) for _ in range(words_per_doc)]
+        if rng.random() < non_ascii_share:
+            words.append(rng.choice(NON_ASCII_WORDS))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def main(n_docs=100_000):
+    corpus = synthetic_corpus(n_docs)
+    print(f"Synthetic corpus: {n_docs} reviews (~10% non-ASCII)\n")
+
+    cases = [
+        ("clean_text", legacy_clean_text, clean_text),
+        ("clean_text_sentiment (regex stage)", legacy_sentiment_text, normalize_sentiment_text),
+        ("sanitize_text", legacy_sanitize_text, sanitize_text),
+    ]
+    for name, old, new in cases:
+        start = time.perf_counter()
+        out_old = [old(t) for t in corpus]
+        t_old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        out_new = clean_batch(corpus, cleaner=new)
+        t_new = time.perf_counter() - start
+
+        print(f"{name}:")
+        print(f"  legacy : {t_old:.3f}s")
+        print(f"  new    : {t_new:.3f}s  ({t_old / t_new:.2f}x)")
+        print(f"  identical output: {out_old == out_new}\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
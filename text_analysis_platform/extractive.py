@@ -0,0 +1,52 @@
+# TextRank for the review app. It is deployed apart from
+# Dynamic-text-analysis-platform, so this mirrors the graph / PageRank
+# in src/summarization.py rather than importing it.
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Similarities below this are dropped to keep the sentence graph sparse
+SIMILARITY_THRESHOLD = 0.01
+DAMPING = 0.85
+
+
+def textrank_scores(sentences, threshold=SIMILARITY_THRESHOLD, max_iter=100, tol=1.0e-6):
+    """
+    TextRank score per sentence: PageRank (power iteration, as in
+    nx.pagerank) over the sparse TF-IDF cosine-similarity graph.
+    """
+    n = len(sentences)
+    try:
+        vectors = TfidfVectorizer(stop_words="english").fit_transform(sentences)
+    except ValueError:  # no usable words in any sentence
+        return np.full(n, 1.0 / max(n, 1))
+
+    graph = (vectors @ vectors.T).tocsr()
+    graph.data[graph.data < threshold] = 0
+    graph.eliminate_zeros()
+
+    out_weight = np.asarray(graph.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transition_t = graph.T.tocsr().multiply(inv_out[None, :]).tocsr()
+
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_last = x
+        x = DAMPING * (transition_t @ x_last + x_last[dangling].sum() / n) + (1 - DAMPING) / n
+        if np.abs(x - x_last).sum() < n * tol:
+            break
+    return x
+
+
+def top_sentences_within_budget(sentences, lengths, budget):
+    """
+    Highest-ranked sentences that fit in `budget` (same unit as lengths),
+    returned in original order.
+    """
+    scores = textrank_scores(sentences)
+    selected, used = [], 0
+    for i in np.argsort(-scores, kind="stable"):
+        if used + lengths[i] <= budget:
+            selected.append(i)
+            used += lengths[i]
+    return [sentences[i] for i in sorted(selected)]
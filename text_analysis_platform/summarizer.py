@@ -1,60 +1,254 @@
+import os
+import nltk
 import torch
-import re
 from transformers import BartForConditionalGeneration, BartTokenizer
 from functools import lru_cache
 
+from extractive import top_sentences_within_budget
+from summary_cache import get_summary_cache, summary_key
+from text_cleaning import sanitize_text
+
 MODEL_NAME = "facebook/bart-large-cnn"
 MAX_INPUT_TOKENS = 1024  # BART encoder limit
+MODES = ("truncate", "chunked", "hybrid")
+
+# Inputs per generate call; similar lengths are batched together
+BATCH_SIZE = 4
+
+# Chunked mode: long inputs are split on sentence boundaries into
+# encoder-sized chunks; at most MAX_CHUNKS (spread over the text) are
+# summarized, then their summaries are summarized again
+MAX_CHUNKS = 8
+CHUNK_SUMMARY_MAX_LEN = 120
+CHUNK_SUMMARY_MIN_LEN = 30
+
+# CPU inference backend: "pytorch" (default), "quantized" (int8 dynamic
+# quantization of Linear layers) or "onnx" (ONNX Runtime via optimum)
+BACKEND = os.environ.get("TEXT_ANALYSIS_BACKEND", "pytorch").lower()
+ONNX_EXPORT_DIR = os.path.join("saved_models", "onnx_bart")
+
+
+def load_onnx_model():
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImportError("The 'onnx' backend needs optimum: pip install optimum[onnxruntime]") from e
+
+    if os.path.isdir(ONNX_EXPORT_DIR):
+        return ORTModelForSeq2SeqLM.from_pretrained(ONNX_EXPORT_DIR)
+    model = ORTModelForSeq2SeqLM.from_pretrained(MODEL_NAME, export=True)
+    model.save_pretrained(ONNX_EXPORT_DIR)
+    return model
 
 @lru_cache(maxsize=1)
-def load_bart_model():
+def load_bart_model(backend=BACKEND):
     tokenizer = BartTokenizer.from_pretrained(MODEL_NAME)
-    model = BartForConditionalGeneration.from_pretrained(MODEL_NAME)
     device = "cpu"
 
+    if backend == "onnx":
+        return tokenizer, load_onnx_model(), device
+    if backend not in ("pytorch", "quantized"):
+        raise ValueError(f"Unknown backend '{backend}'. Use 'pytorch', 'quantized' or 'onnx'.")
+
+    model = BartForConditionalGeneration.from_pretrained(MODEL_NAME)
     model.to(device)
     model.eval()  # set to eval mode for generation
+    if backend == "quantized":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
     return tokenizer, model, device
 
-def sanitize_text(text):
-    if not isinstance(text, str):
-        text = str(text) if text is not None else ""
-    text = re.sub(r"<[^>]+>", " ", text) # Remove HTML tags
-    cleaned = " ".join(text.strip().split())
-    return cleaned
+def chunk_sentences(tokenizer, text, max_tokens=MAX_INPUT_TOKENS):
+    """
+    Splits text on sentence boundaries into chunks that fit the encoder
+    (special tokens included). A single over-long sentence becomes its own
+    chunk and is truncated by the tokenizer.
+    """
+    budget = max_tokens - tokenizer.num_special_tokens_to_add()
+    sentences = nltk.sent_tokenize(text)
+    if not sentences:
+        return []
+    lengths = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]]
+
+    chunks, current, current_len = [], [], 0
+    for sentence, n in zip(sentences, lengths):
+        if current and current_len + n > budget:
+            chunks.append(" ".join(current))
+            current, current_len = [], 0
+        current.append(sentence)
+        current_len += n
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _select_chunks(chunks, max_chunks=MAX_CHUNKS):
+    # Latency budget: keep max_chunks chunks spread evenly over the text
+    if len(chunks) <= max_chunks:
+        return chunks
+    step = (len(chunks) - 1) / (max_chunks - 1) if max_chunks > 1 else 0
+    keep = sorted({round(i * step) for i in range(max_chunks)})
+    return [chunks[i] for i in keep]
+
+
+def condense_text(tokenizer, text, token_budget=None):
+    """
+    Hybrid mode pre-selection: keeps the top TextRank sentences that fit
+    in token_budget tokens (default: the encoder size), in original order.
+    Text that already fits is returned unchanged.
+    """
+    budget = min(token_budget or MAX_INPUT_TOKENS, MAX_INPUT_TOKENS) - tokenizer.num_special_tokens_to_add()
+    sentences = nltk.sent_tokenize(text)
+    lengths = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]] if sentences else []
+    if sum(lengths) <= budget:
+        return text
+    return " ".join(top_sentences_within_budget(sentences, lengths, budget)) or text
+
+
+def _generate(tokenizer, model, device, texts, batch_size=BATCH_SIZE, clamp_min_length=False, **generate_kwargs):
+    """
+    Summarizes several texts with beam search over padded batches. Texts
+    are tokenized once and sorted by length so each batch pads only to its
+    own longest input; summaries come back in input order.
+    clamp_min_length caps min_length at half the shortest input (in
+    tokens) of each batch, so short tail chunks aren't padded out.
+    """
+    input_ids = tokenizer(texts, max_length=MAX_INPUT_TOKENS, truncation=True)["input_ids"]
+    order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+    summaries = [None] * len(texts)
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            batch = tokenizer.pad({"input_ids": [input_ids[i] for i in idx]}, return_tensors="pt")
+            batch_kwargs = dict(generate_kwargs)
+            if clamp_min_length and "min_length" in batch_kwargs:
+                shortest = min(len(input_ids[i]) for i in idx) - tokenizer.num_special_tokens_to_add()
+                batch_kwargs["min_length"] = min(batch_kwargs["min_length"], shortest // 2)
+            summary_ids = model.generate(
+                input_ids=batch["input_ids"].to(device),
+                attention_mask=batch["attention_mask"].to(device),
+                early_stopping=True,
+                **batch_kwargs
+            )
+            for i, summary in zip(idx, tokenizer.batch_decode(summary_ids, skip_special_tokens=True)):
+                summaries[i] = summary
+
+    return summaries
+
+
+def summarize_batch(texts, min_length=20, max_length=50, num_beams=4, length_penalty=1.5, no_repeat_ngram_size=3,
+                    seed=None, mode="truncate", max_chunks=MAX_CHUNKS, batch_size=BATCH_SIZE, use_cache=True,
+                    token_budget=None):
+    """
+    Summarizes many texts in batched generate calls; one summary per text,
+    in input order.
+      mode="truncate" – summarize the first MAX_INPUT_TOKENS tokens
+      mode="chunked"  – map-reduce: the chunks of every long text share one
+                        batched pass, then the joined chunk summaries are
+                        summarized in a second batched pass
+      mode="hybrid"   – summarize only the top TextRank sentences that fit
+                        in token_budget tokens, in original order
+    With use_cache, texts summarized before with the same settings are
+    answered from the persistent summary cache without loading BART.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose from {MODES}.")
+
+    texts = [sanitize_text(t) for t in texts]
+    summaries = ["Text too short to summarize."] * len(texts)
+    todo = [i for i, text in enumerate(texts) if text and len(text) >= 20]
+    beam_kwargs = dict(
+        num_beams=num_beams,
+        length_penalty=length_penalty,
+        no_repeat_ngram_size=no_repeat_ngram_size
+    )
+
+    keys = {}
+    cache = get_summary_cache() if use_cache else None
+    if cache is not None:
+        pending = []
+        for i in todo:
+            keys[i] = summary_key(
+                texts[i], MODEL_NAME, backend=BACKEND, mode=mode, min_length=min_length,
+                max_length=max_length, max_chunks=max_chunks, token_budget=token_budget, **beam_kwargs
+            )
+            cached = cache.get(keys[i])
+            if cached is not None:
+                summaries[i] = cached
+            else:
+                pending.append(i)
+        todo = pending
+
+    if not todo:
+        return summaries
 
-def summarize_text(text, min_length=20, max_length=50, num_beams=4, length_penalty=1.5, no_repeat_ngram_size=3, seed=None):
     tokenizer, model, device = load_bart_model()
     if seed is not None:
         torch.manual_seed(seed)
 
-    text = sanitize_text(text)
-    if not text or len(text) < 20:
-        return "Text too short to summarize."
+    # text index -> input of the final pass
+    inputs = {}
+    chunked = {}
+    for i in todo:
+        if mode == "chunked":
+            chunks = _select_chunks(chunk_sentences(tokenizer, texts[i]), max_chunks)
+            if len(chunks) > 1:
+                chunked[i] = chunks
+                continue
+        if mode == "hybrid":
+            inputs[i] = condense_text(tokenizer, texts[i], token_budget)
+            continue
+        inputs[i] = texts[i]
+
+    if chunked:
+        owners = [i for i, chunks in chunked.items() for _ in chunks]
+        partials = _generate(
+            tokenizer, model, device, [chunk for chunks in chunked.values() for chunk in chunks],
+            batch_size=batch_size,
+            min_length=CHUNK_SUMMARY_MIN_LEN,
+            clamp_min_length=True,
+            max_length=CHUNK_SUMMARY_MAX_LEN,
+            **beam_kwargs
+        )
+        joined = {}
+        for i, partial in zip(owners, partials):
+            joined.setdefault(i, []).append(partial)
+        for i, doc_partials in joined.items():
+            inputs[i] = " ".join(doc_partials)
 
-    inputs = tokenizer(
-        [text], 
-        max_length=MAX_INPUT_TOKENS, 
-        return_tensors="pt", 
-        truncation=True
+    order = list(inputs)
+    outputs = _generate(
+        tokenizer, model, device, [inputs[i] for i in order],
+        batch_size=batch_size, min_length=min_length, max_length=max_length, **beam_kwargs
     )
-    input_ids = inputs["input_ids"].to(device)
-    attention_mask = inputs.get("attention_mask", None)
-    if attention_mask is not None:
-        attention_mask = attention_mask.to(device)
+    for i, summary in zip(order, outputs):
+        summaries[i] = summary
+        if cache is not None:
+            cache.put(keys[i], summary)
+    return summaries
 
-    # Generate Summary
-    with torch.inference_mode():
-        summary_ids = model.generate(
-            input_ids=input_ids,
-            attention_mask=attention_mask,
-            num_beams=num_beams,
-            min_length=min_length,
-            max_length=max_length,
-            length_penalty=length_penalty,
-            early_stopping=True,
-            no_repeat_ngram_size=no_repeat_ngram_size
-        )
-    
-    summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-    return summary
+
+def summarize_chunked(text, min_length=20, max_length=50, num_beams=4, length_penalty=1.5,
+                      no_repeat_ngram_size=3, max_chunks=MAX_CHUNKS, batch_size=BATCH_SIZE):
+    """
+    Map-reduce summary of one long text; see summarize_batch.
+    """
+    return summarize_batch(
+        [text], min_length=min_length, max_length=max_length, num_beams=num_beams,
+        length_penalty=length_penalty, no_repeat_ngram_size=no_repeat_ngram_size,
+        mode="chunked", max_chunks=max_chunks, batch_size=batch_size
+    )[0]
+
+
+def summarize_text(text, min_length=20, max_length=50, num_beams=4, length_penalty=1.5, no_repeat_ngram_size=3, seed=None,
+                   mode="truncate", max_chunks=MAX_CHUNKS, token_budget=None):
+    """
+    mode="truncate" summarizes the first MAX_INPUT_TOKENS tokens;
+    mode="chunked" covers the whole text with summarize_chunked;
+    mode="hybrid" summarizes the top TextRank sentences within token_budget.
+    """
+    return summarize_batch(
+        [text], min_length=min_length, max_length=max_length, num_beams=num_beams,
+        length_penalty=length_penalty, no_repeat_ngram_size=no_repeat_ngram_size,
+        seed=seed, mode=mode, max_chunks=max_chunks, token_budget=token_budget
+    )[0]
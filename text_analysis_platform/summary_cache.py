@@ -0,0 +1,184 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SUMMARY_CACHE_PATH = os.path.join("saved_models", "summary_cache.sqlite")
+# Least recently used summaries are evicted once stored values exceed this
+SUMMARY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Recency updates from hits are written in batches of this size
+TOUCH_BATCH = 64
+
+
+def summary_key(text, model_name, normalize=True, **generation_kwargs):
+    """
+    Content hash of the text plus everything that changes the output:
+    model name and generation settings. normalize=True collapses
+    whitespace first; use normalize=False when the cached value is cut
+    from the raw text (e.g. extracted sentences).
+    """
+    if normalize:
+        text = " ".join(text.split())
+    payload = json.dumps([text, model_name, generation_kwargs], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SummaryCache:
+    """
+    Persistent key -> summary store in a single SQLite file. Values are
+    JSON, so list and string summaries round-trip unchanged. A database
+    error on get / put is treated as a miss / skipped write.
+    """
+
+    def __init__(self, path=SUMMARY_CACHE_PATH, max_bytes=SUMMARY_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)"
+        )
+        self._conn.commit()
+        # Running total of stored bytes, so eviction never scans the table
+        self._total_bytes = self._stored_bytes()
+
+    def _stored_bytes(self):
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+
+    def get(self, key):
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Recency is recorded in memory and written in batches
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                try:
+                    self._flush_touched()
+                    self._conn.commit()
+                except sqlite3.Error:
+                    # Read-only or locked: lose the recency, keep the hit
+                    self._touched = {}
+                    self._conn.rollback()
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        data = json.dumps(value)
+        size = len(data.encode("utf-8"))
+        with self._lock:
+            try:
+                old = self._conn.execute(
+                    "SELECT size FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO summaries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, data, size, time.time())
+                )
+                self._total_bytes += size - (old[0] if old else 0)
+                self._flush_touched()
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error:
+                self._touched = {}
+                self._conn.rollback()
+                try:
+                    self._total_bytes = self._stored_bytes()
+                except sqlite3.Error:
+                    pass
+
+    def _flush_touched(self):
+        if self._touched:
+            touched = [(used, key) for key, used in self._touched.items()]
+            self._touched = {}
+            self._conn.executemany("UPDATE summaries SET last_used = ? WHERE key = ?", touched)
+
+    def _commit(self):
+        try:
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.rollback()
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        freed = 0
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM summaries ORDER BY last_used"):
+            if self._total_bytes - freed <= self.max_bytes:
+                break
+            stale.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM summaries WHERE key = ?", stale)
+        self._total_bytes -= freed
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def close(self):
+        # Writes pending recency updates; registered to run at exit
+        with self._lock:
+            try:
+                self._flush_touched()
+            except sqlite3.Error:
+                pass
+            self._commit()
+            self._conn.close()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM summaries")
+            self._conn.commit()
+            self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+_summary_cache = None
+_summary_cache_failed = False
+
+
+def get_summary_cache(path=SUMMARY_CACHE_PATH):
+    """
+    The process-wide cache, or None when it can't be opened (e.g. a
+    read-only models directory); callers then run without caching.
+    """
+    global _summary_cache, _summary_cache_failed
+    if _summary_cache is None and not _summary_cache_failed:
+        try:
+            _summary_cache = SummaryCache(path)
+            atexit.register(_summary_cache.close)
+        except (OSError, sqlite3.Error):
+            _summary_cache_failed = True
+    return _summary_cache
@@ -0,0 +1,58 @@
+import re
+
+# Patterns are compiled once at import and shared by every cleaner.
+HTML_TAG_PATTERN = re.compile(r"<.*?>")
+HTML_ELEMENT_PATTERN = re.compile(r"<[^>]+>")
+NON_LETTER_PATTERN = re.compile(r"[^a-zA-Z]")
+NON_LOWER_ALPHA_PATTERN = re.compile(r"[^a-z\s]")
+
+
+def _letter_byte(b):
+    c = chr(b)
+    return c.lower() if c.isascii() and c.isalpha() else " "
+
+
+def _lower_alpha_byte(b):
+    c = chr(b).lower()
+    return c if ("a" <= c <= "z" or c.isspace()) else " "
+
+
+# bytes.translate tables for ASCII text, applied in one C-level pass.
+# LETTERS_BYTES:      [^a-zA-Z] -> " ", then lowercase
+# LOWER_ALPHA_BYTES:  lowercase, then [^a-z\s] -> " "
+LETTERS_BYTES = "".join(_letter_byte(b) for b in range(128)).encode("ascii") + b" " * 128
+LOWER_ALPHA_BYTES = "".join(_lower_alpha_byte(b) for b in range(128)).encode("ascii") + b" " * 128
+
+
+def clean_text(text):
+    """
+    Strips HTML tags, keeps only letters, collapses whitespace, lowercases.
+    """
+    text = HTML_TAG_PATTERN.sub(" ", str(text))
+    if text.isascii():
+        text = text.encode("ascii").translate(LETTERS_BYTES).decode("ascii")
+    else:
+        text = NON_LETTER_PATTERN.sub(" ", text).lower()
+    return " ".join(text.split())
+
+
+def normalize_sentiment_text(text):
+    """
+    Lowercases and replaces everything except a-z and whitespace with a
+    space, ready for the spaCy lemmatizer.
+    """
+    text = str(text)
+    if text.isascii():
+        return text.encode("ascii").translate(LOWER_ALPHA_BYTES).decode("ascii")
+    return NON_LOWER_ALPHA_PATTERN.sub(" ", text.lower())
+
+
+def sanitize_text(text):
+    if not isinstance(text, str):
+        text = str(text) if text is not None else ""
+    text = HTML_ELEMENT_PATTERN.sub(" ", text) # Remove HTML tags
+    return " ".join(text.split())
+
+
+def clean_batch(texts, cleaner=clean_text):
+    return [cleaner(t) for t in texts]